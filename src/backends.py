@@ -0,0 +1,290 @@
+import random
+import sys
+from array import array
+from contextlib import contextmanager
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен: без него работает чистый Python
+    np = None
+
+PYTHON = "python"
+NUMPY = "numpy"
+# Меньшие входы сортируются чистым Python: перевод в ndarray и обратно дороже
+_NUMPY_MIN_SIZE = 1024
+# Коды типа array, которые ndarray читает без копирования: np.dtype(код)
+# дает тот же платформенный C-тип (например, 'l' - 4 байта в Windows)
+_NUMPY_TYPECODES = frozenset("bBhHiIlLqQfd")
+_SIGN_BIT = 1 << 63
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+_UINT64_MAX = (1 << 64) - 1
+_FLOAT64_MAX = sys.float_info.max
+
+_active = NUMPY if np is not None else PYTHON
+
+
+def available_backends():
+    """Имена доступных бэкендов: "python" всегда, "numpy" - если он установлен."""
+    return [PYTHON, NUMPY] if np is not None else [PYTHON]
+
+
+def get_backend():
+    """Имя текущего бэкенда генераторов и целочисленных сортировок."""
+    return _active
+
+
+def set_backend(name):
+    """
+    Выбирает бэкенд: "python" или "numpy".
+
+    :raises ValueError: Если бэкенд неизвестен или NumPy не установлен.
+    """
+    global _active
+    if name not in available_backends():
+        raise ValueError(f"Backend {name!r} is not available")
+    _active = name
+
+
+@contextmanager
+def use_backend(name):
+    """Временно переключает бэкенд (например, для сравнения в бенчмарке)."""
+    previous = _active
+    set_backend(name)
+    try:
+        yield
+    finally:
+        set_backend(previous)
+
+
+def numpy_enabled(n=_NUMPY_MIN_SIZE):
+    """Использовать ли векторизованную реализацию для входа размера n."""
+    return _active == NUMPY and n >= _NUMPY_MIN_SIZE
+
+
+# --- Генераторы -----------------------------------------------------------
+#
+# Векторизованные генераторы воспроизводят поток модуля random бит в бит:
+# состояние MT19937 глобального генератора переносится в MT19937 NumPy,
+# из него берутся те же 32-битные слова и тем же способом превращаются в
+# числа, а затем состояние возвращается в random. Поэтому с одним seed
+# результат совпадает с чистым Python, и последующие вызовы random
+# продолжают ту же последовательность.
+
+class _MirroredRandom:
+    """Генератор NumPy, продолжающий поток глобального random."""
+
+    def __init__(self):
+        _, internal, self.gauss_next = random.getstate()
+        self.bits = np.random.MT19937()
+        self.bits.state = {
+            "bit_generator": "MT19937",
+            "state": {"key": np.array(internal[:-1], dtype=np.uint32), "pos": internal[-1]},
+        }
+
+    def words(self, count):
+        """Следующие count 32-битных слов MT19937 (как genrand_uint32)."""
+        return self.bits.random_raw(count).astype(np.uint64)
+
+    def below(self, n, count):
+        """
+        count значений random._randbelow(n) (n < 2**32): слово сдвигается
+        до n.bit_length() бит, значения >= n отбрасываются, как в
+        _randbelow_with_getrandbits. Потребляются ровно те слова, что
+        потребил бы random.
+        """
+        shift = np.uint64(32 - n.bit_length())
+        values = np.empty(count, dtype=np.int64)
+        filled = 0
+        while filled < count:
+            need = count - filled
+            saved = self.bits.state
+            # Принимается не меньше половины попыток: запас вдвое с лишним
+            candidates = self.words(2 * need + 64) >> shift
+            accepted = np.flatnonzero(candidates < n)[:need]
+            if len(accepted) == need:
+                # Лишние слова возвращаются: состояние сдвигается ровно на использованные
+                self.bits.state = saved
+                self.bits.random_raw(int(accepted[-1]) + 1)
+            values[filled:filled + len(accepted)] = candidates[accepted]
+            filled += len(accepted)
+        return values
+
+    def floats(self, count):
+        """count значений random.random() (53 бита из двух слов)."""
+        words = self.words(2 * count).reshape(count, 2)
+        a = (words[:, 0] >> np.uint64(5)).astype(np.float64)
+        b = (words[:, 1] >> np.uint64(6)).astype(np.float64)
+        return (a * 67108864.0 + b) * (1.0 / 9007199254740992.0)
+
+    def commit(self):
+        """Возвращает продвинутое состояние в глобальный random."""
+        state = self.bits.state["state"]
+        internal = tuple(int(w) for w in state["key"]) + (int(state["pos"]),)
+        random.setstate((3, internal, self.gauss_next))
+
+
+def rand_int_array(n, lo, hi):
+    """Векторизованный аналог [random.randint(lo, hi) for _ in range(n)] или None."""
+    width = hi - lo + 1
+    if width <= 0 or width >= 1 << 32 or not (-(1 << 62) < lo < 1 << 62):
+        return None
+    rng = _MirroredRandom()
+    values = rng.below(width, n) + lo
+    rng.commit()
+    return values.tolist()
+
+
+def nearly_sorted(n, swaps):
+    """Векторизованный аналог generators.nearly_sorted (после seed) или None."""
+    if n <= 0 or n >= 1 << 32:
+        return None
+    rng = _MirroredRandom()
+    pairs = rng.below(n, 2 * swaps).reshape(swaps, 2)
+    rng.commit()
+    # Перестановки зависят друг от друга и применяются по порядку; обмен
+    # в списке дешевле обмена скаляров ndarray
+    arr = np.arange(n).tolist()
+    for i, j in pairs.tolist():
+        arr[i], arr[j] = arr[j], arr[i]
+    return arr
+
+
+def many_duplicates(n, k_unique):
+    """Векторизованный аналог generators.many_duplicates (после seed) или None."""
+    if k_unique <= 0 or k_unique >= 1 << 32:
+        return None
+    rng = _MirroredRandom()
+    unique = rng.below(1001, k_unique)
+    values = unique[rng.below(k_unique, n)]
+    rng.commit()
+    return values.tolist()
+
+
+def rand_float_array(n, lo, hi):
+    """Векторизованный аналог [random.uniform(lo, hi) for _ in range(n)]."""
+    rng = _MirroredRandom()
+    values = lo + (hi - lo) * rng.floats(n)
+    rng.commit()
+    return values.tolist()
+
+
+# --- Целочисленные сортировки -------------------------------------------
+
+def _to_ndarray(a):
+    """
+    Вход в ndarray: буфер известного типа - без копирования, список -
+    через np.array. None, если список не из int (все в int64 или все
+    в uint64) или из int и float (float64): остальные входы остаются
+    чистому Python, чтобы ошибки и результат совпадали.
+    """
+    if isinstance(a, (array, memoryview)):
+        fmt = a.typecode if isinstance(a, array) else a.format.lstrip('@')
+        if fmt not in _NUMPY_TYPECODES:
+            return None
+        return np.frombuffer(a, dtype=np.dtype(fmt))
+    if isinstance(a, (bytes, bytearray)):
+        return np.frombuffer(a, dtype=np.uint8)
+    if not all(type(x) is int or type(x) is float for x in a):
+        return None
+    # Смесь int и float становится float64, как и в radix_sort на чистом Python;
+    # целые без float в float64 не переводятся - большие потеряли бы точность.
+    # Тип выбирается проверкой диапазона, а не по исключению при переводе:
+    # NumPy < 2 молча заворачивает отрицательные числа в uint64
+    if any(type(x) is float for x in a):
+        if all(-_FLOAT64_MAX <= x <= _FLOAT64_MAX for x in a if type(x) is int):
+            return np.array(a, dtype=np.float64)
+        return None
+    lo, hi = min(a), max(a)
+    if _INT64_MIN <= lo and hi <= _INT64_MAX:
+        return np.array(a, dtype=np.int64)
+    if 0 <= lo and hi <= _UINT64_MAX:
+        return np.array(a, dtype=np.uint64)
+    return None
+
+
+def _from_ndarray(a, values):
+    """Результат: для буфера - array того же формата, иначе список."""
+    if isinstance(a, array):
+        typecode = a.typecode
+    elif isinstance(a, memoryview):
+        typecode = a.format.lstrip('@')
+    elif isinstance(a, (bytes, bytearray)):
+        typecode = 'B'
+    else:
+        return values.tolist()
+    result = array(typecode)
+    result.frombytes(np.ascontiguousarray(values, dtype=np.dtype(typecode)).tobytes())
+    return result
+
+
+def counting_sort(a, reverse=False):
+    """
+    Векторизованная сортировка подсчетом целых чисел: счетчики через
+    np.bincount (узкий диапазон) или np.unique (широкий), значения -
+    через np.repeat. None, если вход не подходит.
+    """
+    values = _to_ndarray(a)
+    if values is None or values.dtype.kind not in "iu":
+        return None
+    values = values.astype(np.int64) if values.dtype != np.uint64 else values
+    lo = values.min()
+    span = int(values.max()) - int(lo) + 1
+    if span <= 4 * len(values) + 1024:
+        counts = np.bincount((values - lo).astype(np.intp), minlength=span)
+        keys = np.arange(span, dtype=values.dtype) + lo
+    else:
+        keys, counts = np.unique(values, return_counts=True)
+    result = np.repeat(keys, counts)
+    if reverse:
+        result = result[::-1]
+    return _from_ndarray(a, result)
+
+
+def _float_keys(values):
+    """IEEE-754 double -> uint64 с тем же порядком (как sorts._float_to_keys)."""
+    u = values.astype(np.float64).view(np.uint64)
+    negative = (u >> np.uint64(63)).astype(bool)
+    return np.where(negative, ~u, u | np.uint64(_SIGN_BIT))
+
+
+def _keys_float(keys):
+    """Обратное к _float_keys преобразование."""
+    positive = (keys >> np.uint64(63)).astype(bool)
+    return np.where(positive, keys ^ np.uint64(_SIGN_BIT), ~keys).view(np.float64)
+
+
+def radix_sort(a, bits=8, reverse=False):
+    """
+    Векторизованная LSD-сортировка: цифры из bits бит извлекаются сдвигом
+    и маской сразу для всего массива, проход - устойчивая перестановка
+    по цифре (np.argsort kind="stable"). Как и в чистом Python, проходы
+    с одинаковой у всех ключей цифрой пропускаются. None, если вход не подходит.
+    """
+    values = _to_ndarray(a)
+    if values is None:
+        return None
+    if values.dtype.kind == "f":
+        keys = _float_keys(values)
+        width = 64
+    else:
+        signed = values.astype(np.int64) if values.dtype != np.uint64 else values
+        lo = int(signed.min())
+        width = (int(signed.max()) - lo).bit_length()
+        # Вычитание минимума по модулю 2**64 дает точный сдвиг всех ключей
+        keys = signed.view(np.uint64) - np.uint64(lo & ((1 << 64) - 1))
+
+    mask = np.uint64((1 << bits) - 1)
+    for shift in range(0, width, bits):
+        digits = (keys >> np.uint64(shift)) & mask
+        if (digits == digits[0]).all():
+            continue
+        keys = keys[np.argsort(digits, kind="stable")]
+
+    if values.dtype.kind == "f":
+        result = _keys_float(keys)
+    else:
+        result = (keys + np.uint64(lo & ((1 << 64) - 1))).view(signed.dtype)
+    if reverse:
+        result = result[::-1]
+    return _from_ndarray(a, result)
@@ -1,5 +1,12 @@
+import copy
+import gc
+import math
+import statistics
 import time
 
+from src import backends
+from src.instrument import count_operations, trace_memory
+
 
 def timeit_once(func, *args, **kwargs):
     """
@@ -13,23 +20,529 @@ def timeit_once(func, *args, **kwargs):
     return end_time - start_time
 
 
-def benchmark_sorts(arrays, algos):
+# Двусторонние 95% квантили распределения Стьюдента для df = 1..30;
+# при больших df используется нормальное приближение 1.96
+_T_95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+
+def _percentile(sorted_samples, q):
+    """Перцентиль q (0..100) отсортированной выборки с линейной интерполяцией."""
+    pos = (len(sorted_samples) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_samples) - 1)
+    return sorted_samples[lo] + (sorted_samples[hi] - sorted_samples[lo]) * (pos - lo)
+
+
+class BenchResult:
+    """
+    Результат замера одного алгоритма на одном наборе данных.
+
+    samples - время одного вызова (сек) в каждом повторе; если замер
+    завершился исключением, samples пуст, а error содержит его описание.
+    ops - счетчики операций (OpCounts), если замер шел с count_ops.
+    """
+
+    def __init__(self, dataset, algorithm, n, samples=(), loops=0, error=None, ops=None):
+        self.dataset = dataset
+        self.algorithm = algorithm
+        self.n = n
+        self.samples = list(samples)
+        self.loops = loops
+        self.error = error
+        self.ops = ops
+        # Встроенная sorted: статистика не должна зависеть от измеряемого кода
+        self._sorted = sorted(self.samples)
+
+    @property
+    def ok(self):
+        return self.error is None and bool(self.samples)
+
+    @property
+    def min(self):
+        return self._sorted[0]
+
+    @property
+    def median(self):
+        return _percentile(self._sorted, 50)
+
+    @property
+    def p95(self):
+        return _percentile(self._sorted, 95)
+
+    @property
+    def mean(self):
+        return statistics.fmean(self.samples)
+
+    @property
+    def stdev(self):
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    @property
+    def ci95(self):
+        """95% доверительный интервал среднего (распределение Стьюдента)."""
+        k = len(self.samples)
+        if k < 2:
+            return (self.mean, self.mean)
+        t = _T_95[k - 2] if k - 1 <= len(_T_95) else 1.96
+        half = t * self.stdev / math.sqrt(k)
+        return (self.mean - half, self.mean + half)
+
+    def as_dict(self):
+        """Словарь для сериализации (без сырых замеров, если их нет)."""
+        data = {
+            "dataset": self.dataset,
+            "algorithm": self.algorithm,
+            "n": self.n,
+            "loops": self.loops,
+            "samples": self.samples,
+            "error": self.error,
+        }
+        if self.ops is not None:
+            data["ops"] = self.ops.as_dict()
+        if self.ok:
+            data.update(min=self.min, median=self.median, p95=self.p95,
+                        mean=self.mean, stdev=self.stdev, ci95=list(self.ci95))
+        return data
+
+    def __repr__(self):
+        if not self.ok:
+            return f"BenchResult({self.dataset!r}, {self.algorithm!r}, error={self.error!r})"
+        return (f"BenchResult({self.dataset!r}, {self.algorithm!r}, n={self.n}, "
+                f"median={self.median:.6g}, p95={self.p95:.6g}, repeats={len(self.samples)})")
+
+
+def _copy_data(data):
+    """
+    Свежая копия данных для одного вызова: list, array, bytes, bytearray
+    (copy.copy) или memoryview (копия в собственном буфере того же формата).
+    """
+    if isinstance(data, memoryview):
+        return memoryview(bytearray(data)).cast(data.format)
+    return copy.copy(data)
+
+
+def _time_loops(func, data, loops):
+    """
+    Время loops вызовов func на свежих копиях data.
+    Копии готовятся до замера, сборщик мусора на время замера отключен.
+    """
+    copies = [_copy_data(data) for _ in range(loops)]
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start_time = time.perf_counter()
+        for arr in copies:
+            func(arr)
+        return time.perf_counter() - start_time
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def measure(func, data, *, warmup=1, repeat=None, min_time=0.01, max_time=1.0,
+            min_repeat=5, max_repeat=50, max_call_time=None):
+    """
+    Статистически устойчивый замер времени func(копия data).
+
+    Сначала warmup прогревочных вызовов, затем калибровка: число вызовов
+    в одном повторе подбирается так, чтобы повтор длился не меньше
+    min_time (это гасит погрешность таймера). Если repeat не задан,
+    число повторов подбирается так, чтобы весь замер уложился в max_time,
+    но не меньше min_repeat и не больше max_repeat.
+
+    Если задан max_call_time и первый калибровочный вызов длился дольше,
+    замер на этом заканчивается: возвращается единственный отсчет.
+
+    :param func: Функция, принимающая копию data.
+    :param data: Данные (копируются перед каждым вызовом вне замера).
+    :param max_call_time: Предельное время одного вызова, сек (None - без предела).
+    :return: Пара (samples, loops): время одного вызова в каждом повторе
+             и число вызовов на повтор.
+    """
+    for _ in range(warmup):
+        func(_copy_data(data))
+
+    loops = 1
+    elapsed = _time_loops(func, data, loops)
+    if max_call_time is not None and elapsed > max_call_time:
+        return [elapsed], loops
+    while elapsed < min_time:
+        # Оценка по последнему замеру с запасом, но не более чем в 10 раз за шаг
+        estimate = int(min_time / max(elapsed, 1e-9) * loops * 1.2) + 1
+        loops = min(estimate, loops * 10)
+        elapsed = _time_loops(func, data, loops)
+
+    if repeat is None:
+        repeat = int(max_time / elapsed)
+        repeat = max(min_repeat, min(repeat, max_repeat))
+    samples = [_time_loops(func, data, loops) / loops for _ in range(repeat)]
+    return samples, loops
+
+
+def benchmark_sorts(arrays, algos, count_ops=False, **measure_options):
     """
     Запуск переданных алгоритмов на переданных наборах данных.
 
     :param arrays: Словарь {имя_набора: список_данных}.
     :param algos: Словарь {имя_алгоритма: функция_сортировки}.
-    :return: Словарь результатов {имя_набора: {имя_алгоритма: время}}.
-             Если произошла ошибка, время = -1.0.
+    :param count_ops: Если True, после замера времени отдельным запуском
+                      считаются операции (поле ops результата).
+    :param measure_options: Параметры measure (warmup, repeat, min_time, max_time...).
+    :return: Список BenchResult в порядке (набор, алгоритм). Если алгоритм
+             выбросил исключение, у результата заполнено поле error.
+    """
+    results = []
+    for arr_name, arr in arrays.items():
+        for algo_name, algo in algos.items():
+            try:
+                samples, loops = measure(algo, arr, **measure_options)
+                ops = count_operations(algo, arr)[1] if count_ops else None
+                results.append(BenchResult(arr_name, algo_name, len(arr), samples, loops, ops=ops))
+            except Exception as e:
+                results.append(BenchResult(arr_name, algo_name, len(arr), error=repr(e)))
+    return results
+
+
+class MemoryResult:
+    """
+    Результат замера памяти одного алгоритма на одном наборе данных.
+
+    peak - пик памяти (байт), выделенной вызовом сверх занятой до него;
+    blocks - число блоков, выделенных вызовом и живых после него;
+    inplace - сортировался ли сам массив (иначе алгоритм делал копию).
+    """
+
+    def __init__(self, dataset, algorithm, n, peak=0, blocks=0, inplace=False, error=None):
+        self.dataset = dataset
+        self.algorithm = algorithm
+        self.n = n
+        self.peak = peak
+        self.blocks = blocks
+        self.inplace = inplace
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def bytes_per_element(self):
+        return self.peak / self.n if self.n else 0.0
+
+    def as_dict(self):
+        return {
+            "dataset": self.dataset,
+            "algorithm": self.algorithm,
+            "n": self.n,
+            "inplace": self.inplace,
+            "peak": self.peak,
+            "bytes_per_element": self.bytes_per_element,
+            "blocks": self.blocks,
+            "error": self.error,
+        }
+
+    def __repr__(self):
+        if not self.ok:
+            return f"MemoryResult({self.dataset!r}, {self.algorithm!r}, error={self.error!r})"
+        return (f"MemoryResult({self.dataset!r}, {self.algorithm!r}, n={self.n}, "
+                f"peak={self.peak}, blocks={self.blocks}, inplace={self.inplace})")
+
+
+def benchmark_memory(arrays, algos, inplace=False):
+    """
+    Замер памяти переданных алгоритмов на переданных наборах данных.
+
+    Копия данных для режима inplace готовится до начала трассировки,
+    поэтому в пик попадает только память самого алгоритма.
+
+    :param arrays: Словарь {имя_набора: список_данных}.
+    :param algos: Словарь {имя_алгоритма: функция_сортировки}.
+    :param inplace: Если True, алгоритмы вызываются с inplace=True.
+    :return: Список MemoryResult в порядке (набор, алгоритм).
+    """
+    results = []
+    for arr_name, arr in arrays.items():
+        for algo_name, algo in algos.items():
+            try:
+                if inplace:
+                    peak, blocks = trace_memory(algo, _copy_data(arr), inplace=True)
+                else:
+                    peak, blocks = trace_memory(algo, arr)
+                results.append(MemoryResult(arr_name, algo_name, len(arr), peak, blocks, inplace))
+            except Exception as e:
+                results.append(MemoryResult(arr_name, algo_name, len(arr), inplace=inplace,
+                                            error=repr(e)))
+    return results
+
+
+def benchmark_structure_memory(structures, n):
+    """
+    Память на элемент структуры данных, заполненной n элементами.
+
+    Элементы создаются до начала трассировки, поэтому пик - это память
+    самой структуры (узлы или буферы), а не хранимых чисел.
+
+    :param structures: Словарь {имя: (класс, имя_метода_добавления)},
+        например {"Stack": (Stack, "push")}.
+    :param n: Число элементов.
+    :return: Список MemoryResult; набор - имя метода добавления.
+    """
+    values = list(range(n))
+
+    def fill(data, cls, method):
+        structure = cls()
+        add = getattr(structure, method)
+        for x in data:
+            add(x)
+        return structure
+
+    results = []
+    for name, (cls, method) in structures.items():
+        try:
+            peak, blocks = trace_memory(fill, values, cls=cls, method=method)
+            results.append(MemoryResult(method, name, n, peak, blocks))
+        except Exception as e:
+            results.append(MemoryResult(method, name, n, error=repr(e)))
+    return results
+
+
+def benchmark_backends(arrays, algos, names=None, **measure_options):
+    """
+    Сравнение бэкендов (src.backends) на одних и тех же данных.
+
+    :param arrays: Словарь {имя_набора: список_данных}.
+    :param algos: Словарь {имя_алгоритма: функция_сортировки}.
+    :param names: Бэкенды для сравнения (по умолчанию все доступные).
+    :param measure_options: Параметры measure.
+    :return: Список BenchResult; имя алгоритма - "алгоритм [бэкенд]".
+    """
+    results = []
+    for backend in names or backends.available_backends():
+        with backends.use_backend(backend):
+            named = {f"{algo_name} [{backend}]": algo for algo_name, algo in algos.items()}
+            results.extend(benchmark_sorts(arrays, named, **measure_options))
+    return results
+
+
+def benchmark_generators(generators, n, names=None, seed=0, **measure_options):
+    """
+    Время генерации набора из n элементов каждым генератором под каждым бэкендом.
+
+    :param generators: Словарь {имя_набора: функция (n, seed) -> список}.
+    :param n: Размер набора.
+    :param names: Бэкенды для сравнения (по умолчанию все доступные).
+    :param seed: Зерно генераторов.
+    :param measure_options: Параметры measure.
+    :return: Список BenchResult; алгоритм - бэкенд, набор - генератор.
+    """
+    results = []
+    for backend in names or backends.available_backends():
+        with backends.use_backend(backend):
+            for gen_name, gen in generators.items():
+                try:
+                    samples, loops = measure(lambda _: gen(n, seed=seed), [], **measure_options)
+                    results.append(BenchResult(gen_name, backend, n, samples, loops))
+                except Exception as e:
+                    results.append(BenchResult(gen_name, backend, n, error=repr(e)))
+    return results
+
+
+def benchmark_math(funcs, sizes, dataset="math", **measure_options):
+    """
+    Время вычисления func(n) для каждой функции и каждого n
+    (например, factorial против factorial_fast).
+
+    :param funcs: Словарь {имя: функция одного целого аргумента}.
+    :param sizes: Значения n.
+    :param dataset: Имя набора в результатах.
+    :param measure_options: Параметры measure.
+    :return: Список BenchResult; алгоритм - имя функции, n - аргумент.
+    """
+    results = []
+    for n in sizes:
+        for name, func in funcs.items():
+            try:
+                samples, loops = measure(lambda _: func(n), [], **measure_options)
+                results.append(BenchResult(dataset, name, n, samples, loops))
+            except Exception as e:
+                results.append(BenchResult(dataset, name, n, error=repr(e)))
+    return results
+
+
+def count_key_calls(func, arr, key):
+    """
+    Считает, сколько раз сортировка func вызывает функцию-ключ key.
+
+    :param func: Функция сортировки с параметром key.
+    :param arr: Данные для сортировки.
+    :param key: Функция-ключ.
+    :return: Количество вызовов key.
+    """
+    calls = 0
+
+    def counting_key(x):
+        nonlocal calls
+        calls += 1
+        return key(x)
+
+    func(_copy_data(arr), key=counting_key)
+    return calls
+
+
+def benchmark_key_calls(arrays, algos, key=abs):
+    """
+    Замер числа вызовов функции-ключа для переданных алгоритмов.
+
+    При предвычислении ключей вызовов ровно столько, сколько элементов;
+    все, что сверх этого, - повторные вычисления ключа при сравнениях.
+
+    :param arrays: Словарь {имя_набора: список_данных}.
+    :param algos: Словарь {имя_алгоритма: функция_сортировки}.
+    :param key: Функция-ключ (по умолчанию abs).
+    :return: Словарь {имя_набора: {имя_алгоритма: (вызовы, вызовов_на_элемент)}}.
     """
     results = {}
     for arr_name, arr in arrays.items():
         results[arr_name] = {}
         for algo_name, algo in algos.items():
-            arr_copy = arr.copy()
-            try:
-                exec_time = timeit_once(algo, arr_copy)
-                results[arr_name][algo_name] = exec_time
-            except Exception:
-                results[arr_name][algo_name] = -1.0
-    return results
\ No newline at end of file
+            calls = count_key_calls(algo, arr, key)
+            per_element = calls / len(arr) if arr else 0.0
+            results[arr_name][algo_name] = (calls, per_element)
+    return results
+
+
+# Модели сложности для подгонки кривых масштабирования
+COMPLEXITY_MODELS = {
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log2(n),
+    "O(n^2)": lambda n: n * n,
+}
+
+
+def geometric_sizes(start, stop, factor=2):
+    """
+    Геометрическая сетка размеров: start, start*factor, ... (не больше stop).
+
+    :raises ValueError: Если start < 2 или factor <= 1.
+    """
+    if start < 2 or factor <= 1:
+        raise ValueError("Sizes need start >= 2 and factor > 1")
+    sizes = []
+    n = start
+    while n <= stop:
+        sizes.append(int(n))
+        n *= factor
+    return sizes
+
+
+def fit_complexity(sizes, times):
+    """
+    Подгонка замеров t(n) к моделям t = c * f(n) из COMPLEXITY_MODELS.
+
+    Коэффициент c подбирается в логарифмическом масштабе (все точки
+    весят одинаково независимо от n), качество - среднеквадратичное
+    отклонение log t от модели. Дополнительно считается эмпирический
+    показатель степени k (наклон log t по log n).
+
+    :return: Словарь {"best": модель, "exponent": k,
+             "models": {модель: (c, отклонение)}} или None, если точек меньше двух.
+    """
+    points = [(n, t) for n, t in zip(sizes, times) if t > 0]
+    if len(points) < 2:
+        return None
+    log_n = [math.log(n) for n, _ in points]
+    log_t = [math.log(t) for _, t in points]
+
+    models = {}
+    for name, f in COMPLEXITY_MODELS.items():
+        diffs = [lt - math.log(f(n)) for (n, _), lt in zip(points, log_t)]
+        log_c = statistics.fmean(diffs)
+        residual = math.sqrt(statistics.fmean([(d - log_c) ** 2 for d in diffs]))
+        models[name] = (math.exp(log_c), residual)
+
+    mean_n = statistics.fmean(log_n)
+    mean_t = statistics.fmean(log_t)
+    spread = sum((x - mean_n) ** 2 for x in log_n)
+    exponent = sum((x - mean_n) * (y - mean_t) for x, y in zip(log_n, log_t)) / spread
+
+    best = None
+    for name, (_, residual) in models.items():
+        if best is None or residual < models[best][1]:
+            best = name
+    return {"best": best, "exponent": exponent, "models": models}
+
+
+class ScalingCurve:
+    """
+    Кривая масштабирования одного алгоритма на одном генераторе данных:
+    замеры BenchResult по возрастанию n и подгонка модели сложности.
+    stopped_at - первый размер, на котором превышен бюджет времени
+    (большие размеры не измерялись), либо None.
+    """
+
+    def __init__(self, algorithm, dataset, results, stopped_at=None):
+        self.algorithm = algorithm
+        self.dataset = dataset
+        self.results = results
+        self.stopped_at = stopped_at
+
+    @property
+    def sizes(self):
+        return [r.n for r in self.results if r.ok]
+
+    @property
+    def times(self):
+        return [r.median for r in self.results if r.ok]
+
+    @property
+    def fit(self):
+        return fit_complexity(self.sizes, self.times)
+
+    def __repr__(self):
+        fit = self.fit
+        best = fit["best"] if fit else None
+        return (f"ScalingCurve({self.algorithm!r}, {self.dataset!r}, "
+                f"sizes={self.sizes}, best={best!r}, stopped_at={self.stopped_at})")
+
+
+def scaling_suite(algos, generators, sizes, time_budget=1.0, seed=0, **measure_options):
+    """
+    Прогон алгоритмов по сетке размеров для каждого генератора данных.
+
+    Алгоритм снимается с прогона на данном генераторе, как только медиана
+    одного вызова превысит time_budget или он выбросит исключение, поэтому
+    O(n^2)-сортировки не останавливают весь прогон на больших n. Вызов,
+    превысивший time_budget, не повторяется: на этом размере остается
+    один отсчет.
+
+    :param algos: Словарь {имя_алгоритма: функция_сортировки}.
+    :param generators: Словарь {имя_набора: функция (n, seed) -> список}.
+    :param sizes: Возрастающие размеры (например, geometric_sizes(...)).
+    :param time_budget: Предельное время одного вызова, сек.
+    :param seed: Зерно генераторов (одинаковые данные для всех алгоритмов).
+    :param measure_options: Параметры measure.
+    :return: Список ScalingCurve в порядке (генератор, алгоритм).
+    """
+    options = {"warmup": 0, "min_repeat": 3, "max_time": time_budget,
+               "max_call_time": time_budget}
+    options.update(measure_options)
+    curves = {(gen_name, algo_name): ScalingCurve(algo_name, gen_name, [])
+              for gen_name in generators for algo_name in algos}
+
+    for n in sizes:
+        for gen_name, generate in generators.items():
+            data = generate(n, seed=seed)
+            for algo_name, algo in algos.items():
+                curve = curves[(gen_name, algo_name)]
+                if curve.stopped_at is not None:
+                    continue
+                result = benchmark_sorts({gen_name: data}, {algo_name: algo}, **options)[0]
+                curve.results.append(result)
+                if not result.ok or result.median > time_budget:
+                    curve.stopped_at = n
+    return list(curves.values())
@@ -0,0 +1,335 @@
+import argparse
+import csv
+import io
+import json
+import sys
+from array import array
+from contextlib import contextmanager
+
+from src import backends, math_utils
+from src.benchmark import benchmark_sorts
+from src.external import external_sort
+from src.generators import GENERATORS
+from src.isolation import BenchCase, run_isolated
+from src.results_store import (
+    DEFAULT_RESULTS_FILE, add_compare_arguments, run_compare, save_results
+)
+from src.sorts import SORTS
+from src.streaming import read_binary, read_text, write_text
+
+MATH_FUNCTIONS = {
+    "factorial": math_utils.factorial,
+    "factorial_recursive": math_utils.factorial_recursive,
+    "factorial_fast": math_utils.factorial_fast,
+    "log_factorial": math_utils.log_factorial,
+    "fibo": math_utils.fibo,
+    "fibo_recursive": math_utils.fibo_recursive,
+    "fibo_fast": math_utils.fibo_fast,
+}
+
+# Столбцы CSV результатов бенчмарка; столбцы операций - только с --count-ops
+_BENCH_COLUMNS = ("dataset", "algorithm", "n", "loops", "repeats", "min", "median", "p95",
+                  "mean", "stdev", "ci95_low", "ci95_high", "error")
+_OPS_COLUMNS = ("comparisons", "moves", "key_calls", "max_depth", "peak_memory")
+
+
+def parse_numbers(text):
+    """
+    Разбирает числа из текста: JSON-массив или числа через пробельные символы.
+    Если все числа целые - список int, иначе список float.
+
+    :raises ValueError: Если текст содержит не числа.
+    """
+    text = text.strip()
+    if text.startswith("["):
+        values = json.loads(text)
+        if not all(type(x) in (int, float) for x in values):
+            raise ValueError("JSON input must be an array of numbers")
+        return values
+    parts = text.split()
+    try:
+        return [int(x) for x in parts]
+    except ValueError:
+        return [float(x) for x in parts]
+
+
+@contextmanager
+def _open_input(path):
+    """
+    Открывает файл или stdin (путь "-") как двоичный буферизованный поток.
+
+    :raises ValueError: Если stdin - терминал (чтение заблокировалось бы).
+    """
+    if path == "-":
+        if sys.stdin is None or sys.stdin.isatty():
+            raise ValueError("No input: pass a file path or pipe data to stdin")
+        yield sys.stdin.buffer
+    else:
+        with open(path, "rb") as f:
+            yield f
+
+
+@contextmanager
+def _open_output(path):
+    """Открывает файл или stdout (путь None или "-") как двоичный поток."""
+    if path in (None, "-"):
+        sys.stdout.flush()
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+    else:
+        with open(path, "wb") as f:
+            yield f
+
+
+def _read_numbers(f, binary, typecode):
+    """
+    Числа из потока в компактный array: двоичные элементы typecode,
+    JSON-массив (определяется по первому символу буфера) или текст,
+    разбираемый потоково блоками.
+    """
+    if binary:
+        return read_binary(f, typecode or 'q')
+    if f.peek(1).lstrip()[:1] == b"[":
+        values = parse_numbers(f.read().decode())
+        return array('d' if any(type(x) is float for x in values) else 'q', values)
+    return read_text(f, typecode)
+
+
+def _write_output(path, text):
+    """Пишет текст в файл или в stdout (путь None или "-")."""
+    if path in (None, "-"):
+        sys.stdout.write(text)
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+
+
+def _format_numbers(values, fmt):
+    """Список чисел в формате text (по числу в строке), json или csv."""
+    if fmt == "json":
+        return json.dumps(values) + "\n"
+    if fmt == "csv":
+        return _csv_text(["value"], ([x] for x in values))
+    return "".join(f"{x}\n" for x in values)
+
+
+def _csv_text(header, rows):
+    """Таблица в формате CSV."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def _bench_rows(results, with_ops):
+    """Строки CSV для списка BenchResult."""
+    for r in results:
+        if r.ok:
+            lo, hi = r.ci95
+            row = [r.dataset, r.algorithm, r.n, r.loops, len(r.samples), r.min, r.median,
+                   r.p95, r.mean, r.stdev, lo, hi, ""]
+        else:
+            row = [r.dataset, r.algorithm, r.n, r.loops, 0] + [""] * 7 + [r.error]
+        if with_ops:
+            ops = r.ops.as_dict() if r.ops is not None else {}
+            row += [ops.get(name, "") for name in _OPS_COLUMNS]
+        yield row
+
+
+def _format_bench(results, fmt, with_ops):
+    """Результаты бенчмарка в формате text, json или csv."""
+    if fmt == "json":
+        return json.dumps([r.as_dict() for r in results], indent=2) + "\n"
+    if fmt == "csv":
+        header = _BENCH_COLUMNS + (_OPS_COLUMNS if with_ops else ())
+        return _csv_text(header, _bench_rows(results, with_ops))
+    lines = []
+    for r in results:
+        if r.ok:
+            lines.append(f"{r.algorithm} / {r.dataset} n={r.n}: median {r.median:.6f} sec "
+                         f"(p95 {r.p95:.6f}, repeats {len(r.samples)})")
+        else:
+            lines.append(f"{r.algorithm} / {r.dataset} n={r.n}: ошибка {r.error}")
+    return "".join(line + "\n" for line in lines)
+
+
+def cmd_sort(args):
+    """Команда sort: сортировка чисел из файла или stdin."""
+    if args.external:
+        if args.input == "-" or args.output in (None, "-"):
+            raise ValueError("External sort needs input and output file paths")
+        total = external_sort(args.input, args.output, binary=args.binary,
+                              typecode='d' if args.float else 'q',
+                              memory_limit=args.memory_mb * 1024 * 1024, reverse=args.reverse)
+        print(f"Sorted {total} elements into {args.output}", file=sys.stderr)
+        return 0
+    typecode = 'd' if args.float else ('q' if args.binary else None)
+    with _open_input(args.input) as f:
+        values = _read_numbers(f, args.binary, typecode)
+    result = SORTS[args.algorithm](values, reverse=args.reverse, inplace=True)
+    with _open_output(args.output) as out:
+        if args.binary:
+            result.tofile(out)
+        elif args.format == "text":
+            write_text(out, result)
+        else:
+            out.write(_format_numbers(result.tolist(), args.format).encode())
+    return 0
+
+
+def cmd_bench(args):
+    """Команда bench: замеры выбранных алгоритмов на выбранных генераторах и размерах."""
+    options = {"max_time": args.max_time}
+    if args.repeat is not None:
+        options["repeat"] = args.repeat
+    if args.backend is not None:
+        backends.set_backend(args.backend)
+
+    if args.isolate:
+        cases = [BenchCase(algo, gen, n, args.seed)
+                 for n in args.sizes for gen in args.generators for algo in args.algorithms]
+        results = run_isolated(cases, timeout=args.timeout, jobs=args.jobs,
+                               memory_limit=args.memory_limit, backend=args.backend, **options)
+    else:
+        algos = {name: SORTS[name] for name in args.algorithms}
+        results = []
+        for n in args.sizes:
+            arrays = {gen: GENERATORS[gen](n, seed=args.seed) for gen in args.generators}
+            results.extend(benchmark_sorts(arrays, algos, count_ops=args.count_ops, **options))
+
+    _write_output(args.output, _format_bench(results, args.format,
+                                             args.count_ops and not args.isolate))
+    if args.save:
+        saved = save_results(results, args.save)
+        print(f"Saved {saved} results to {args.save}", file=sys.stderr)
+    return 1 if any(not r.ok for r in results) else 0
+
+
+@contextmanager
+def _unlimited_int_digits():
+    """
+    Снимает ограничение на длину десятичной записи int (Python 3.11+:
+    по умолчанию 4300 цифр) - результаты factorial_fast и fibo_fast
+    бывают намного длиннее.
+    """
+    if not hasattr(sys, "set_int_max_str_digits"):
+        yield
+        return
+    previous = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    try:
+        yield
+    finally:
+        sys.set_int_max_str_digits(previous)
+
+
+def cmd_math(args):
+    """Команда math: значение математической функции."""
+    result = MATH_FUNCTIONS[args.function](args.n)
+    with _unlimited_int_digits():
+        if args.format == "json":
+            text = json.dumps({"function": args.function, "n": args.n, "result": result}) + "\n"
+        else:
+            text = f"{result}\n"
+    _write_output(args.output, text)
+    return 0
+
+
+def cmd_gen(args):
+    """Команда gen: генерация набора данных."""
+    values = GENERATORS[args.generator](args.n, seed=args.seed)
+    _write_output(args.output, _format_numbers(values, args.format))
+    return 0
+
+
+def _positive_int(text):
+    """Тип аргумента argparse: целое число не меньше 1."""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return value
+
+
+def build_parser():
+    """Парсер командной строки с подкомандами sort, bench, math, gen и compare."""
+    parser = argparse.ArgumentParser(prog="python -m src.main",
+                                     description="Алгоритмический мини-пакет")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("sort", help="отсортировать числа из файла или stdin")
+    p.add_argument("input", nargs="?", default="-", help="входной файл (по умолчанию stdin)")
+    p.add_argument("-a", "--algorithm", choices=sorted(SORTS), default="merge")
+    p.add_argument("-r", "--reverse", action="store_true", help="по убыванию")
+    p.add_argument("-f", "--format", choices=("text", "json", "csv"), default="text")
+    p.add_argument("-o", "--output", help="выходной файл (по умолчанию stdout)")
+    p.add_argument("--external", action="store_true",
+                   help="внешняя сортировка файла, не помещающегося в память")
+    p.add_argument("--memory-mb", type=_positive_int, default=64,
+                   help="бюджет памяти внешней сортировки, МБ")
+    p.add_argument("--binary", action="store_true",
+                   help="двоичные вход и выход (сырые элементы int64 или double)")
+    p.add_argument("--float", action="store_true", help="числа с плавающей точкой")
+    p.set_defaults(handler=cmd_sort)
+
+    p = sub.add_parser("bench", help="замеры времени сортировок")
+    p.add_argument("-a", "--algorithms", nargs="+", choices=sorted(SORTS),
+                   default=[name for name in SORTS if name != "bubble"])
+    p.add_argument("-g", "--generators", nargs="+", choices=sorted(GENERATORS),
+                   default=["random"])
+    p.add_argument("-n", "--sizes", nargs="+", type=_positive_int, default=[1000])
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--backend", choices=("python", "numpy"),
+                   help="бэкенд генераторов и целочисленных сортировок (по умолчанию лучший доступный)")
+    p.add_argument("--repeat", type=_positive_int, help="число повторов (по умолчанию авто)")
+    p.add_argument("--max-time", type=float, default=1.0, help="бюджет одного замера, сек")
+    p.add_argument("--count-ops", action="store_true", help="подсчет операций (без --isolate)")
+    p.add_argument("--isolate", action="store_true", help="каждый случай в отдельном процессе")
+    p.add_argument("--timeout", type=float, default=10.0, help="таймаут случая с --isolate, сек")
+    p.add_argument("--jobs", type=_positive_int, default=1, help="параллельных процессов с --isolate")
+    p.add_argument("--memory-limit", type=_positive_int, help="лимит памяти процесса, байт")
+    p.add_argument("-f", "--format", choices=("text", "json", "csv"), default="text")
+    p.add_argument("-o", "--output", help="выходной файл (по умолчанию stdout)")
+    p.add_argument("--save", nargs="?", const=DEFAULT_RESULTS_FILE,
+                   help="дописать замеры в хранилище результатов")
+    p.set_defaults(handler=cmd_bench)
+
+    p = sub.add_parser("math", help="математические функции")
+    p.add_argument("function", choices=sorted(MATH_FUNCTIONS))
+    p.add_argument("n", type=int)
+    p.add_argument("-f", "--format", choices=("text", "json"), default="text")
+    p.add_argument("-o", "--output", help="выходной файл (по умолчанию stdout)")
+    p.set_defaults(handler=cmd_math)
+
+    p = sub.add_parser("gen", help="генерация набора данных")
+    p.add_argument("generator", choices=sorted(GENERATORS))
+    p.add_argument("n", type=_positive_int)
+    p.add_argument("--seed", type=int)
+    p.add_argument("-f", "--format", choices=("text", "json", "csv"), default="text")
+    p.add_argument("-o", "--output", help="выходной файл (по умолчанию stdout)")
+    p.set_defaults(handler=cmd_gen)
+
+    p = sub.add_parser("compare", help="поиск регрессий в хранилище результатов")
+    add_compare_arguments(p)
+    p.set_defaults(handler=run_compare)
+    return parser
+
+
+def main(argv=None):
+    """
+    Неинтерактивная командная строка. Никогда не ждет ввода с клавиатуры:
+    данные читаются из файла или stdin, результат пишется в stdout или файл.
+
+    :return: Код возврата: 0 - успех, 1 - ошибка выполнения (или неудачный
+             замер, или регрессия для compare), 2 - ошибка аргументов.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError, TypeError, RecursionError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+import os
+import tempfile
+from array import array
+
+from src.sorts import merge_runs, radix_sort
+from src.streaming import iter_text_blocks
+
+# Оценка памяти на один элемент при сортировке участка в памяти:
+# участок, ключи, буфер проходов и результат - по array из 8 байт
+_BYTES_PER_ITEM = 32
+_DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+# Наибольшее число серий в одном слиянии: каждая серия - открытый файл,
+# а типичный лимит открытых файлов процесса - 1024
+_DEFAULT_MAX_FAN_IN = 256
+
+
+def _iter_text_arrays(f, typecode):
+    """Потоково разбирает текстовый файл в блоки array(typecode)."""
+    parse = int if typecode == 'q' else float
+    for tokens in iter_text_blocks(f):
+        yield array(typecode, map(parse, tokens))
+
+
+def _iter_binary_arrays(f, typecode, block_items):
+    """Потоково читает из двоичного файла блоки array(typecode)."""
+    while True:
+        block = array(typecode)
+        try:
+            block.fromfile(f, block_items)
+        except EOFError:
+            # Неполный последний блок: fromfile уже добавил прочитанное
+            pass
+        if not block:
+            break
+        yield block
+
+
+def _iter_binary_numbers(f, typecode, block_items):
+    """Потоково читает из двоичного файла элементы array(typecode) блоками."""
+    for block in _iter_binary_arrays(f, typecode, block_items):
+        yield from block
+
+
+def _iter_chunks(blocks, chunk_items, typecode):
+    """Собирает поток блоков array в участки array не длиннее chunk_items."""
+    chunk = array(typecode)
+    for block in blocks:
+        start = 0
+        while start < len(block):
+            take = min(chunk_items - len(chunk), len(block) - start)
+            chunk.extend(block[start:start + take])
+            start += take
+            if len(chunk) == chunk_items:
+                yield chunk
+                chunk = array(typecode)
+    if chunk:
+        yield chunk
+
+
+def _write_numbers(f, numbers, typecode, binary, block_items):
+    """Записывает поток чисел в файл блоками (двоично или по числу в строке)."""
+    block = []
+    for x in numbers:
+        block.append(x)
+        if len(block) == block_items:
+            _write_block(f, block, typecode, binary)
+            block = []
+    if block:
+        _write_block(f, block, typecode, binary)
+
+
+def _write_block(f, block, typecode, binary):
+    """Записывает один блок чисел двоично или по числу в строке."""
+    if binary:
+        array(typecode, block).tofile(f)
+    else:
+        f.write("\n".join(map(str, block)).encode())
+        f.write(b"\n")
+
+
+def _merge_files(paths, output_path, typecode, binary, reverse, memory_limit):
+    """Сливает отсортированные двоичные серии paths в файл output_path."""
+    # Бюджет делится между буферами чтения серий и буфером записи
+    block_items = max(1, memory_limit // (8 * (len(paths) + 1)))
+    run_files = [open(path, "rb") for path in paths]
+    try:
+        runs = [_iter_binary_numbers(rf, typecode, block_items) for rf in run_files]
+        with open(output_path, "wb") as out:
+            _write_numbers(out, merge_runs(runs, reverse=reverse), typecode, binary, block_items)
+    finally:
+        for rf in run_files:
+            rf.close()
+
+
+def external_sort(input_path, output_path, *, binary=False, typecode='q',
+                  memory_limit=_DEFAULT_MEMORY_LIMIT, reverse=False, algo=radix_sort,
+                  max_fan_in=_DEFAULT_MAX_FAN_IN):
+    """
+    Внешняя сортировка слиянием для файлов, не помещающихся в память.
+
+    Входной файл читается потоком участками прямо в array(typecode),
+    каждый участок сортируется на месте алгоритмом пакета и сбрасывается
+    во временный файл (серию),
+    затем серии сливаются k-путевым слиянием через кучу. Если серий
+    больше max_fan_in, слияние идет в несколько проходов: группы по
+    max_fan_in серий сливаются в промежуточные серии, пока их не
+    останется не больше max_fan_in, поэтому одновременно открыто не
+    больше max_fan_in файлов.
+
+    :param input_path: Путь к входному файлу.
+    :param output_path: Путь к выходному файлу.
+    :param binary: True - файлы содержат сырые элементы array(typecode),
+                   False - текст с числами через пробельные символы.
+    :param typecode: 'q' для целых чисел, 'd' для чисел с плавающей точкой.
+    :param memory_limit: Бюджет памяти в байтах на участок и буферы слияния.
+    :param reverse: Если True, сортирует по убыванию.
+    :param algo: Функция сортировки участка с параметрами reverse и inplace.
+    :param max_fan_in: Наибольшее число серий в одном слиянии.
+    :return: Количество отсортированных элементов.
+    :raises ValueError: Если typecode не 'q'/'d', бюджет памяти не положителен
+                        или max_fan_in < 2.
+    """
+    if typecode not in ('q', 'd'):
+        raise ValueError("External sort supports only 'q' and 'd' typecodes")
+    if memory_limit <= 0:
+        raise ValueError("Memory limit must be positive")
+    if max_fan_in < 2:
+        raise ValueError("Merge fan-in must be at least 2")
+    chunk_items = max(1, memory_limit // _BYTES_PER_ITEM)
+
+    total = 0
+    with tempfile.TemporaryDirectory(prefix="external_sort_") as tmp_dir:
+        run_paths = []
+        with open(input_path, "rb") as f:
+            if binary:
+                blocks = _iter_binary_arrays(f, typecode, chunk_items)
+            else:
+                blocks = _iter_text_arrays(f, typecode)
+            for chunk in _iter_chunks(blocks, chunk_items, typecode):
+                run_path = os.path.join(tmp_dir, f"run_{len(run_paths)}.bin")
+                with open(run_path, "wb") as run_file:
+                    # Сортировки принимают и возвращают array без перевода в список
+                    algo(chunk, reverse=reverse, inplace=True).tofile(run_file)
+                run_paths.append(run_path)
+                total += len(chunk)
+
+        merged = 0
+        while len(run_paths) > max_fan_in:
+            next_paths = []
+            for start in range(0, len(run_paths), max_fan_in):
+                group = run_paths[start:start + max_fan_in]
+                if len(group) == 1:
+                    next_paths.append(group[0])
+                    continue
+                merged_path = os.path.join(tmp_dir, f"merged_{merged}.bin")
+                merged += 1
+                _merge_files(group, merged_path, typecode, True, reverse, memory_limit)
+                for path in group:
+                    os.remove(path)
+                next_paths.append(merged_path)
+            run_paths = next_paths
+
+        _merge_files(run_paths, output_path, typecode, binary, reverse, memory_limit)
+    return total
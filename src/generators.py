@@ -1,5 +1,8 @@
 import random
 
+from src import backends
+
+
 def rand_int_array(n, lo, hi, *, distinct=False, seed=None):
     """
     Генерация списка случайных целых чисел.
@@ -16,6 +19,10 @@ def rand_int_array(n, lo, hi, *, distinct=False, seed=None):
         if (hi - lo + 1) < n:
             raise ValueError("Not enough distinct values in range")
         return random.sample(range(lo, hi + 1), n)
+    if backends.numpy_enabled(n):
+        values = backends.rand_int_array(n, lo, hi)
+        if values is not None:
+            return values
     return [random.randint(lo, hi) for _ in range(n)]
 
 
@@ -25,6 +32,11 @@ def nearly_sorted(n, swaps, *, seed=None):
     """
     if seed is not None:
         random.seed(seed)
+    # Векторизуются только случайные индексы, поэтому порог - по числу перестановок
+    if backends.numpy_enabled(swaps):
+        arr = backends.nearly_sorted(n, swaps)
+        if arr is not None:
+            return arr
     arr = list(range(n))
     for _ in range(swaps):
         i = random.randint(0, n - 1)
@@ -39,6 +51,10 @@ def many_duplicates(n, k_unique=5, *, seed=None):
     """
     if seed is not None:
         random.seed(seed)
+    if backends.numpy_enabled(n):
+        values = backends.many_duplicates(n, k_unique)
+        if values is not None:
+            return values
     unique_elements = [random.randint(0, 1000) for _ in range(k_unique)]
     return [random.choice(unique_elements) for _ in range(n)]
 
@@ -52,4 +68,16 @@ def rand_float_array(n, lo=0.0, hi=1.0, *, seed=None):
     """Генерирует список случайных чисел с плавающей точкой."""
     if seed is not None:
         random.seed(seed)
-    return [random.uniform(lo, hi) for _ in range(n)]
\ No newline at end of file
+    if backends.numpy_enabled(n):
+        return backends.rand_float_array(n, lo, hi)
+    return [random.uniform(lo, hi) for _ in range(n)]
+
+
+# Наборы данных для бенчмарков: имя -> функция (n, seed) -> список
+GENERATORS = {
+    "random": lambda n, seed=None: rand_int_array(n, 0, n, seed=seed),
+    "nearly_sorted": lambda n, seed=None: nearly_sorted(n, max(1, n // 100), seed=seed),
+    "many_duplicates": lambda n, seed=None: many_duplicates(n, seed=seed),
+    "reverse_sorted": lambda n, seed=None: reverse_sorted(n),
+    "random_float": lambda n, seed=None: rand_float_array(n, seed=seed),
+}
@@ -0,0 +1,225 @@
+import gc
+import sys
+import tracemalloc
+
+from src import sorts
+
+# Сортировки без сравнений элементов: обертка элементов сломала бы арифметику
+_NON_COMPARISON = {sorts.counting_sort, sorts.radix_sort}
+
+
+class OpCounts:
+    """
+    Счетчики операций одного запуска сортировки.
+
+    comparisons - вызовы операторов сравнения элементов (или ключей);
+    moves - записи элементов в рабочий массив (обмен - это две записи);
+    key_calls - вызовы функции-ключа;
+    max_depth - наибольшая глубина вложенных вызовов функций sorts;
+    peak_memory - пик дополнительной памяти (байт) по tracemalloc.
+
+    Счетчик, который для данной сортировки не измерялся (comparisons и
+    moves у сортировок без сравнений), равен None, а не 0.
+    """
+
+    def __init__(self):
+        self.comparisons = 0
+        self.moves = 0
+        self.key_calls = 0
+        self.max_depth = 0
+        self.peak_memory = 0
+
+    def as_dict(self):
+        return {
+            "comparisons": self.comparisons,
+            "moves": self.moves,
+            "key_calls": self.key_calls,
+            "max_depth": self.max_depth,
+            "peak_memory": self.peak_memory,
+        }
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"OpCounts({fields})"
+
+
+class _Counted:
+    """
+    Обертка значения, считающая каждое сравнение порядка в общем OpCounts.
+
+    Равенство не считается: сортировки сравнивают элементы только через
+    <, <=, >, >=, а == вызывает сравнение кортежей (ключ, индекс) перед
+    каждым < - иначе одно сравнение ключей считалось бы дважды.
+    """
+
+    __slots__ = ("value", "counts")
+
+    def __init__(self, value, counts):
+        self.value = value
+        self.counts = counts
+
+    def __lt__(self, other):
+        self.counts.comparisons += 1
+        return self.value < (other.value if type(other) is _Counted else other)
+
+    def __le__(self, other):
+        self.counts.comparisons += 1
+        return self.value <= (other.value if type(other) is _Counted else other)
+
+    def __gt__(self, other):
+        self.counts.comparisons += 1
+        return self.value > (other.value if type(other) is _Counted else other)
+
+    def __ge__(self, other):
+        self.counts.comparisons += 1
+        return self.value >= (other.value if type(other) is _Counted else other)
+
+    def __eq__(self, other):
+        return self.value == (other.value if type(other) is _Counted else other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+
+class _CountingList(list):
+    """
+    Рабочий массив, считающий записи элементов (в том числе срезами
+    и добавлением в конец, как в корзины bucket_sort).
+    """
+
+    counts = None
+
+    def append(self, value):
+        self.counts.moves += 1
+        super().append(value)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            self.counts.moves += len(value)
+        else:
+            self.counts.moves += 1
+        super().__setitem__(index, value)
+
+
+def _depth_profiler(counts):
+    """Профилировщик sys.setprofile, отслеживающий глубину вызовов внутри sorts."""
+    filename = sorts.__file__
+    depth = 0
+
+    def profiler(frame, event, arg):
+        nonlocal depth
+        if frame.f_code.co_filename != filename:
+            return
+        if event == "call":
+            depth += 1
+            if depth > counts.max_depth:
+                counts.max_depth = depth
+        elif event == "return":
+            depth -= 1
+
+    return profiler
+
+
+def trace_memory(func, data, **kwargs):
+    """
+    Замер памяти одного вызова func(data, **kwargs) под tracemalloc.
+
+    Пик считается сверх памяти, занятой до вызова, поэтому данные нужно
+    подготовить заранее. Число блоков - это блоки, выделенные вызовом и
+    живые после него (результат и все, что он удерживает); временные
+    буферы, освобожденные внутри вызова, видны только в пике.
+
+    :param func: Вызываемая функция.
+    :param data: Первый аргумент func.
+    :param kwargs: Прочие аргументы func.
+    :return: Пара (peak, blocks): пик в байтах и число новых живых блоков.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    # Собственные структуры tracemalloc не относятся к замеру
+    own = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    try:
+        gc.collect()
+        before = tracemalloc.take_snapshot().filter_traces(own)
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        result = func(data, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1] - base
+        after = tracemalloc.take_snapshot().filter_traces(own)
+        blocks = sum(stat.count_diff for stat in after.compare_to(before, "traceback")
+                     if stat.count_diff > 0)
+        del result
+        return peak, blocks
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def count_operations(func, data, key=None, **kwargs):
+    """
+    Запуск сортировки в режиме подсчета операций.
+
+    Инструментирование включается только на время вызова: элементы
+    (или ключи) оборачиваются счетчиком сравнений, рабочий массив
+    подменяется считающим записи, глубина вызовов отслеживается через
+    sys.setprofile. Пик памяти измеряется отдельным, чистым запуском под
+    tracemalloc. Вне этой функции сортировки работают без изменений.
+
+    :param func: Функция из src.sorts.
+    :param data: Данные для сортировки (не изменяются).
+    :param key: Функция-ключ (передается, только если задана).
+    :param kwargs: Прочие аргументы func (reverse, k, ...).
+    :return: Пара (результат func, OpCounts).
+    """
+    counts = OpCounts()
+    wrap = func not in _NON_COMPARISON
+    call_kwargs = dict(kwargs)
+
+    if key is not None:
+        def counted_key(x):
+            counts.key_calls += 1
+            k = key(x)
+            return _Counted(k, counts) if wrap else k
+
+        call_kwargs["key"] = counted_key
+        arg = list(data)
+    elif wrap:
+        arg = [_Counted(x, counts) for x in data]
+    else:
+        arg = list(data)
+
+    def make_work_list(iterable=()):
+        work = _CountingList(iterable)
+        work.counts = counts
+        return work
+
+    previous = sorts._work_list
+    previous_profiler = sys.getprofile()
+    sorts._work_list = make_work_list
+    sys.setprofile(_depth_profiler(counts))
+    try:
+        result = func(arg, **call_kwargs)
+    finally:
+        # Профилировщик, включенный до вызова, восстанавливается
+        sys.setprofile(previous_profiler)
+        sorts._work_list = previous
+
+    if not wrap:
+        # Сортировки без сравнений не сравнивают элементы и не пишут
+        # в рабочий массив: эти счетчики не измерялись
+        counts.comparisons = None
+        counts.moves = None
+
+    if key is None and wrap:
+        if isinstance(result, list):
+            result = [x.value if type(x) is _Counted else x for x in result]
+        elif type(result) is _Counted:
+            result = result.value
+
+    memory_kwargs = dict(kwargs)
+    if key is not None:
+        memory_kwargs["key"] = key
+    counts.peak_memory = trace_memory(func, list(data), **memory_kwargs)[0]
+    return result, counts
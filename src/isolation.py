@@ -0,0 +1,166 @@
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+try:
+    import resource
+    _HAS_RESOURCE = True
+except ImportError:  # не-POSIX платформы: лимит памяти не ставится
+    _HAS_RESOURCE = False
+
+from src import backends
+from src.benchmark import BenchResult, measure
+from src.generators import GENERATORS
+from src.sorts import SORTS
+
+# Свежий интерпретатор на каждый случай: куча родителя не наследуется
+_START_METHOD = "spawn"
+_DEFAULT_TIMEOUT = 10.0
+
+
+class BenchCase:
+    """
+    Один случай изолированного бенчмарка: алгоритм из SORTS и набор
+    из GENERATORS задаются именами, данные генерируются в дочернем
+    процессе по (n, seed), поэтому в процесс передаются только имена.
+    """
+
+    __slots__ = ("algorithm", "dataset", "n", "seed")
+
+    def __init__(self, algorithm, dataset, n, seed=0):
+        self.algorithm = algorithm
+        self.dataset = dataset
+        self.n = n
+        self.seed = seed
+
+    def __repr__(self):
+        return f"BenchCase({self.algorithm!r}, {self.dataset!r}, n={self.n}, seed={self.seed})"
+
+
+def available_cpus():
+    """Номера процессоров, доступных процессу (все, если привязка не поддерживается)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _limit_process(cpu, memory_limit):
+    """Привязка к процессору и лимит адресного пространства (где доступны)."""
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+    if memory_limit is not None and _HAS_RESOURCE:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            memory_limit = min(memory_limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+
+
+def _run_case(conn, algorithm, dataset, n, seed, cpu, memory_limit, backend, measure_options):
+    """Тело дочернего процесса: отправляет ("ok", samples, loops) или ("error", описание)."""
+    try:
+        _limit_process(cpu, memory_limit)
+        if backend is not None:
+            backends.set_backend(backend)
+        data = GENERATORS[dataset](n, seed=seed)
+        samples, loops = measure(SORTS[algorithm], data, **measure_options)
+        conn.send(("ok", samples, loops))
+    except BaseException as e:
+        conn.send(("error", repr(e)))
+    finally:
+        conn.close()
+
+
+def _start(ctx, case, cpu, memory_limit, backend, measure_options):
+    """Запускает процесс для случая; возвращает (процесс, конец канала)."""
+    recv_conn, send_conn = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run_case, daemon=True,
+                       args=(send_conn, case.algorithm, case.dataset, case.n, case.seed,
+                             cpu, memory_limit, backend, measure_options))
+    proc.start()
+    send_conn.close()
+    return proc, recv_conn
+
+
+def _finish(case, proc, conn, timed_out, timeout):
+    """Останавливает процесс и превращает его ответ в BenchResult."""
+    message = None
+    if not timed_out:
+        try:
+            message = conn.recv()
+        except EOFError:
+            pass
+    conn.close()
+    if proc.is_alive():
+        proc.kill()
+    proc.join()
+
+    if timed_out:
+        error = f"timeout after {timeout} sec"
+    elif message is None:
+        error = f"worker exited with code {proc.exitcode}"
+    elif message[0] == "error":
+        error = message[1]
+    else:
+        return BenchResult(case.dataset, case.algorithm, case.n, message[1], message[2])
+    return BenchResult(case.dataset, case.algorithm, case.n, error=error)
+
+
+def run_isolated(cases, timeout=_DEFAULT_TIMEOUT, jobs=1, memory_limit=None, pin=True,
+                 backend=None, **measure_options):
+    """
+    Прогон случаев бенчмарка, каждый в отдельном свежем процессе.
+
+    Случай, не уложившийся в timeout (по настенным часам, включая
+    генерацию данных), принудительно завершается и получает ошибку
+    "timeout", остальные продолжаются. С pin каждый процесс привязан
+    к своему процессору (os.sched_setaffinity), memory_limit ограничивает
+    адресное пространство процесса (resource.RLIMIT_AS, только POSIX).
+
+    jobs=1 - режим точности: случаи идут по одному. jobs > 1 - режим
+    пропускной способности: до jobs случаев одновременно на разных
+    процессорах (замеры при этом мешают друг другу сильнее).
+
+    :param cases: Итерируемое BenchCase.
+    :param timeout: Предельное время одного случая, сек.
+    :param jobs: Число одновременно работающих процессов.
+    :param memory_limit: Лимит адресного пространства процесса в байтах.
+    :param pin: Привязывать ли процессы к процессорам.
+    :param backend: Бэкенд src.backends в дочерних процессах (по умолчанию их собственный).
+    :param measure_options: Параметры measure.
+    :return: Список BenchResult в порядке cases.
+    :raises ValueError: Если jobs < 1 или timeout не положителен.
+    """
+    if jobs < 1:
+        raise ValueError("Number of jobs must be at least 1")
+    if timeout <= 0:
+        raise ValueError("Timeout must be positive")
+    cases = list(cases)
+    ctx = multiprocessing.get_context(_START_METHOD)
+    free_cpus = available_cpus() if pin else []
+    results = [None] * len(cases)
+    pending = list(range(len(cases)))
+    pending.reverse()
+    # conn -> (индекс случая, процесс, процессор, срок)
+    running = {}
+
+    while pending or running:
+        while pending and len(running) < jobs:
+            i = pending.pop()
+            cpu = free_cpus.pop(0) if free_cpus else None
+            proc, conn = _start(ctx, cases[i], cpu, memory_limit, backend, measure_options)
+            running[conn] = (i, proc, cpu, time.monotonic() + timeout)
+
+        now = time.monotonic()
+        nearest = min(deadline for _, _, _, deadline in running.values())
+        ready = wait(list(running), timeout=max(0.0, nearest - now))
+        now = time.monotonic()
+        for conn in list(running):
+            i, proc, cpu, deadline = running[conn]
+            if conn in ready or now >= deadline:
+                del running[conn]
+                results[i] = _finish(cases[i], proc, conn, conn not in ready, timeout)
+                if cpu is not None:
+                    free_cpus.append(cpu)
+                    free_cpus.sort()
+    return results
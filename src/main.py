@@ -1,9 +1,17 @@
 import sys
-from src.math_utils import factorial, factorial_recursive, fibo, fibo_recursive
-from src.structures import Stack, Queue
-from src.generators import rand_int_array, nearly_sorted, reverse_sorted
-from src.benchmark import benchmark_sorts
-import src.sorts
+from src.math_utils import (
+    factorial, factorial_recursive, factorial_fast, factorial_mod, factorial_approx,
+    fibo, fibo_recursive, fibo_fast, fibo_mod, fibo_range
+)
+from src.structures import Stack, Queue, LinkedStack, LinkedQueue
+from src.generators import rand_int_array, nearly_sorted, reverse_sorted, GENERATORS
+from src.external import external_sort
+from src.results_store import save_results, DEFAULT_RESULTS_FILE
+from src.benchmark import (
+    benchmark_sorts, benchmark_key_calls, benchmark_memory, benchmark_backends,
+    benchmark_generators, benchmark_math, benchmark_structure_memory, timeit_once, scaling_suite, geometric_sizes
+)
+from src import backends, cli, sorts
 
 
 def run_benchmarks():
@@ -25,6 +33,15 @@ def run_benchmarks():
     print(f"Stack min: {s.min()}")
     print(f"Pop: {s.pop()}")
     print(f"Stack min after pop: {s.min()}")
+    structures = {
+        "Stack": (Stack, "push"),
+        "LinkedStack": (LinkedStack, "push"),
+        "Queue": (Queue, "enqueue"),
+        "LinkedQueue": (LinkedQueue, "enqueue"),
+    }
+    for r in benchmark_structure_memory(structures, 100000):
+        print(f"  {r.algorithm}: {r.bytes_per_element:.1f} B/elem, {r.blocks} blocks" if r.ok
+              else f"  {r.algorithm}: ошибка {r.error}")
     print()
 
     # 3. Бенчмарк сортировок
@@ -39,19 +56,119 @@ def run_benchmarks():
         "Bubble": sorts.bubble_sort,
         "Quick": sorts.quick_sort,
         "Heap": sorts.heap_sort,
+        "Merge": sorts.merge_sort,
         "Radix": sorts.radix_sort
     }
 
-    results = benchmark_sorts(arrays, algos)
-
-    for arr_name, res in results.items():
+    results = benchmark_sorts(arrays, algos, count_ops=True, max_time=0.3)
+
+    current = None
+    for r in results:
+        if r.dataset != current:
+            current = r.dataset
+            print(f"\nDataset: {current}")
+        if not r.ok:
+            print(f"  {r.algorithm}: ошибка {r.error}")
+            continue
+        lo, hi = r.ci95
+        print(f"  {r.algorithm}: median {r.median:.6f} sec "
+              f"(min {r.min:.6f}, p95 {r.p95:.6f}, stdev {r.stdev:.6f}, "
+              f"95% CI [{lo:.6f}, {hi:.6f}], repeats {len(r.samples)})")
+        ops = r.ops
+        comparisons = "-" if ops.comparisons is None else ops.comparisons
+        moves = "-" if ops.moves is None else ops.moves
+        print(f"      cmp {comparisons}, moves {moves}, depth {ops.max_depth}, "
+              f"peak {ops.peak_memory} B")
+
+    saved = save_results(results)
+    print(f"\nСохранено замеров в {DEFAULT_RESULTS_FILE}: {saved}")
+
+    # 4. Число вызовов функции-ключа (key=abs)
+    print("\n--- Key Calls (key=abs) ---")
+    key_algos = {
+        "Bubble": sorts.bubble_sort,
+        "Quick": sorts.quick_sort,
+        "Heap": sorts.heap_sort,
+        "Merge": sorts.merge_sort,
+        "Bucket": sorts.bucket_sort
+    }
+    key_results = benchmark_key_calls(arrays, key_algos)
+    for arr_name, res in key_results.items():
         print(f"\nDataset: {arr_name}")
-        for algo_name, t in res.items():
-            print(f"  {algo_name}: {t:.6f} sec")
+        for algo_name, (calls, per_element) in res.items():
+            print(f"  {algo_name}: {calls} calls ({per_element:.2f} per element)")
+
+    # 5. Merge Sort на готовых сериях: время на элемент не растет с n
+    print("\n--- Merge Sort: sorted / reverse (O(n)) ---")
+    for n in (1000, 10000, 100000):
+        t_sorted = timeit_once(sorts.merge_sort, list(range(n)))
+        t_reverse = timeit_once(sorts.merge_sort, reverse_sorted(n))
+        print(f"  n={n}: sorted {t_sorted / n * 1e9:.1f} ns/elem, "
+              f"reverse {t_reverse / n * 1e9:.1f} ns/elem")
+
+    # 6. Память: копирующий режим против сортировки на месте
+    print("\n--- Memory: copy / in-place ---")
+    mem_algos = dict(algos, Counting=sorts.counting_sort, Bucket=sorts.bucket_sort)
+    copy_results = benchmark_memory(arrays, mem_algos)
+    inplace_results = benchmark_memory(arrays, mem_algos, inplace=True)
+    current = None
+    for copy_r, inplace_r in zip(copy_results, inplace_results):
+        if copy_r.dataset != current:
+            current = copy_r.dataset
+            print(f"\nDataset: {current}")
+        if not (copy_r.ok and inplace_r.ok):
+            print(f"  {copy_r.algorithm}: ошибка {copy_r.error or inplace_r.error}")
+            continue
+        print(f"  {copy_r.algorithm}: copy {copy_r.peak} B ({copy_r.bytes_per_element:.1f} B/elem, "
+              f"{copy_r.blocks} blocks), in-place {inplace_r.peak} B "
+              f"({inplace_r.bytes_per_element:.1f} B/elem, {inplace_r.blocks} blocks)")
+
+    # 7. Бэкенды: чистый Python против NumPy (если установлен)
+    print(f"\n--- Backends: {', '.join(backends.available_backends())} ---")
+    big = {"random_100000": rand_int_array(100000, 0, 100000, seed=1)}
+    int_algos = {"Counting": sorts.counting_sort, "Radix": sorts.radix_sort}
+    for r in benchmark_backends(big, int_algos, max_time=0.3):
+        print(f"  {r.algorithm}: median {r.median:.6f} sec" if r.ok else f"  {r.algorithm}: ошибка {r.error}")
+    for r in benchmark_generators(GENERATORS, 100000, max_time=0.3):
+        print(f"  {r.dataset} [{r.algorithm}]: median {r.median:.6f} sec" if r.ok
+              else f"  {r.dataset} [{r.algorithm}]: ошибка {r.error}")
+
+    # 8. Факториал: последовательное умножение против дерева произведений и prime swing
+    print("\n--- Factorial ---")
+    factorials = {
+        "factorial": factorial,
+        "factorial_recursive": factorial_recursive,
+        "factorial_fast[split]": factorial_fast,
+        "factorial_fast[swing]": lambda n: factorial_fast(n, method="swing"),
+    }
+    for r in benchmark_math(factorials, (1000, 10000, 50000), dataset="factorial", max_time=0.3):
+        print(f"  n={r.n} {r.algorithm}: median {r.median:.6f} sec" if r.ok
+              else f"  n={r.n} {r.algorithm}: ошибка {r.error}")
 
     input("\nНажмите Enter, чтобы вернуться в меню...")
 
 
+def run_scaling_benchmarks(sizes=None, time_budget=0.5):
+    """Кривые масштабирования всех сортировок на всех генераторах данных."""
+    print("\n=== КРИВЫЕ МАСШТАБИРОВАНИЯ ===")
+    if sizes is None:
+        sizes = geometric_sizes(256, 65536, 4)
+    curves = scaling_suite(sorts.SORTS, GENERATORS, sizes, time_budget=time_budget)
+
+    for curve in curves:
+        print(f"\n{curve.algorithm} / {curve.dataset}")
+        for r in curve.results:
+            if r.ok:
+                print(f"  n={r.n}: {r.median:.6f} sec")
+            else:
+                print(f"  n={r.n}: ошибка {r.error}")
+        if curve.stopped_at is not None:
+            print(f"  остановлен на n={curve.stopped_at} (бюджет {time_budget} sec)")
+        fit = curve.fit
+        if fit:
+            print(f"  модель: {fit['best']}, показатель степени {fit['exponent']:.2f}")
+
+
 def get_int_input(prompt):
     """Безопасный ввод целого числа."""
     while True:
@@ -85,7 +202,13 @@ def interactive_math():
         print("1. Факториал (Итеративно)")
         print("2. Факториал (Рекурсивно)")
         print("3. Фибоначчи (Итеративно)")
-        print("4. Фибоначчи (Рекурсивно)")
+        print("4. Фибоначчи (Рекурсивно, с запоминанием)")
+        print("5. Фибоначчи (Быстрое удвоение)")
+        print("6. Фибоначчи по модулю")
+        print("7. Диапазон чисел Фибоначчи")
+        print("8. Факториал (Prime swing, для больших N)")
+        print("9. Факториал по модулю")
+        print("10. Факториал (Приближенно)")
         print("0. Назад")
 
         choice = input("Ваш выбор: ")
@@ -93,7 +216,7 @@ def interactive_math():
         if choice == '0':
             break
 
-        if choice in ('1', '2', '3', '4'):
+        if choice in ('1', '2', '3', '4', '5', '6', '7', '8', '9', '10'):
             n = get_int_input("Введите N: ")
             try:
                 if choice == '1':
@@ -103,7 +226,23 @@ def interactive_math():
                 elif choice == '3':
                     print(f"Fibo({n}) = {fibo(n)}")
                 elif choice == '4':
-                    print(f"Fibo_rec({n}) = {fibo_recursive(n)}")
+                    print(f"Fibo_rec({n}) = {fibo_recursive(n, memo=True)}")
+                elif choice == '5':
+                    print(f"Fibo_fast({n}) = {fibo_fast(n)}")
+                elif choice == '6':
+                    m = get_int_input("Введите модуль M: ")
+                    print(f"Fibo({n}) mod {m} = {fibo_mod(n, m)}")
+                elif choice == '7':
+                    stop = get_int_input("Введите конец диапазона (не включая): ")
+                    print(f"Fibo[{n}:{stop}] = {fibo_range(n, stop)}")
+                elif choice == '8':
+                    print(f"Factorial_fast({n}) = {factorial_fast(n, method='swing')}")
+                elif choice == '9':
+                    m = get_int_input("Введите модуль M: ")
+                    print(f"Factorial({n}) mod {m} = {factorial_mod(n, m)}")
+                elif choice == '10':
+                    mantissa, exponent = factorial_approx(n)
+                    print(f"Factorial({n}) ~ {mantissa:.10f}e+{exponent}")
             except ValueError as e:
                 print(f"Ошибка вычисления: {e}")
             except RecursionError:
@@ -119,9 +258,10 @@ def interactive_sorts():
         print("1. Bubble Sort")
         print("2. Quick Sort")
         print("3. Counting Sort (только int)")
-        print("4. Radix Sort (только int >= 0)")
+        print("4. Radix Sort")
         print("5. Bucket Sort")
         print("6. Heap Sort")
+        print("7. Merge Sort (TimSort)")
         print("0. Назад")
 
         choice = input("Ваш выбор: ")
@@ -134,7 +274,8 @@ def interactive_sorts():
             '3': sorts.counting_sort,
             '4': sorts.radix_sort,
             '5': sorts.bucket_sort,
-            '6': sorts.heap_sort
+            '6': sorts.heap_sort,
+            '7': sorts.merge_sort
         }
 
         if choice in algo_map:
@@ -145,15 +286,6 @@ def interactive_sorts():
             reverse_in = input("Обратный порядок (y/n)? ").lower() == 'y'
 
             try:
-                # Специальная проверка для Radix, так как он капризный
-                if choice == '4':
-                    if any(x < 0 for x in arr):
-                        print("Ошибка: Radix Sort не работает с отрицательными числами.")
-                        continue
-                    if any(isinstance(x, float) for x in arr):
-                        print("Ошибка: Radix Sort работает только с целыми числами.")
-                        continue
-
                 # Специальная проверка для Counting, если пользователь ввел float
                 if choice == '3' and any(isinstance(x, float) for x in arr):
                     print("Ошибка: Counting Sort работает только с целыми числами.")
@@ -232,13 +364,39 @@ def interactive_structures():
                     print(f"Ошибка: {e}")
 
 
-def main():
-    """Главное меню программы."""
+def interactive_external():
+    """Режим внешней сортировки файла, не помещающегося в память."""
+    print("\n--- ВНЕШНЯЯ СОРТИРОВКА ФАЙЛА ---")
+    input_path = input("Входной файл: ").strip()
+    output_path = input("Выходной файл: ").strip()
+    binary = input("Двоичный формат (y/n)? ").lower() == 'y'
+    typecode = 'd' if input("Числа с плавающей точкой (y/n)? ").lower() == 'y' else 'q'
+    memory_mb = get_int_input("Бюджет памяти, МБ: ")
+    reverse_in = input("Обратный порядок (y/n)? ").lower() == 'y'
+    try:
+        total = external_sort(input_path, output_path, binary=binary, typecode=typecode,
+                              memory_limit=memory_mb * 1024 * 1024, reverse=reverse_in)
+        print(f"Отсортировано элементов: {total}")
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}")
+
+
+def main(argv=None):
+    """
+    Главное меню программы. Если переданы аргументы командной строки,
+    работает неинтерактивно через src.cli (меню не показывается).
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:
+        sys.exit(cli.main(argv))
     while True:
         print("1. Интерактивный режим: Математика")
         print("2. Интерактивный режим: Сортировки")
         print("3. Интерактивный режим: Структуры данных")
         print("4. Автоматический режим (Бенчмарки)")
+        print("5. Внешняя сортировка файла")
+        print("6. Кривые масштабирования сортировок")
         print("0. Выход")
 
         choice = input("\nВыберите режим: ")
@@ -251,6 +409,10 @@ def main():
             interactive_structures()
         elif choice == '4':
             run_benchmarks()
+        elif choice == '5':
+            interactive_external()
+        elif choice == '6':
+            run_scaling_benchmarks()
         elif choice == '0':
             print("Выход завершен.")
             sys.exit(0)
@@ -0,0 +1,156 @@
+from collections import OrderedDict
+
+from src.math_utils import _fibo_pair, _range_product
+
+_DEFAULT_MAXSIZE = 128
+# Факториалы до этого n берутся из таблицы контрольных точек
+_DEFAULT_TABLE_SIZE = 10 ** 4
+# Шаг контрольных точек: в таблице хранится только каждый k!, кратный шагу,
+# остальные получаются домножением не более чем на шаг - 1 малых чисел
+_DEFAULT_TABLE_STEP = 64
+# До стольких шагов от последнего F(n) сложения дешевле быстрого удвоения
+_FIBO_STEP_LIMIT = 64
+
+
+class MathCache:
+    """
+    Необязательный кэш результатов factorial и fibo.
+
+    Готовые значения хранятся в LRU-кэше на maxsize записей (None - без
+    ограничения, 0 - без хранения). Промах не считается с нуля:
+
+    - кэш помнит последнее вычисленное значение каждой функции, и
+      соседние запросы (F(n + 1) после F(n), (n + 1)! после n!) стоят
+      одного шага;
+    - факториалы до table_size достраиваются от ближайшей контрольной
+      точки таблицы (каждый table_step-й факториал); таблица строится
+      при первом обращении.
+
+    Счетчики hits и misses показывают, хватает ли размера кэша.
+    """
+
+    def __init__(self, maxsize=_DEFAULT_MAXSIZE, table_size=_DEFAULT_TABLE_SIZE,
+                 table_step=_DEFAULT_TABLE_STEP):
+        """
+        :param maxsize: Наибольшее число записей LRU (None - без ограничения).
+        :param table_size: Граница таблицы факториалов (0 - без таблицы).
+        :param table_step: Шаг контрольных точек таблицы.
+        :raises ValueError: Если maxsize, table_size отрицательны или table_step < 1.
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("Cache size cannot be negative")
+        if table_size < 0:
+            raise ValueError("Table size cannot be negative")
+        if table_step < 1:
+            raise ValueError("Table step must be at least 1")
+        self.maxsize = maxsize
+        self.table_size = table_size
+        self.table_step = table_step
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._table = None
+        # Последние вычисленные значения: (n, n!) и (n, F(n), F(n+1))
+        self._factorial_last = (0, 1)
+        self._fibo_last = (0, 0, 1)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        """Значение из LRU (с обновлением порядка) или None."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _put(self, key, value):
+        """Сохраняет значение, вытесняя самые давние записи сверх maxsize."""
+        if self.maxsize == 0:
+            return
+        self._entries[key] = value
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _checkpoint(self, n):
+        """Ближайшая контрольная точка таблицы (k, k!) с k <= n."""
+        if self._table is None:
+            self._table = [1]
+            for k in range(self.table_step, self.table_size + 1, self.table_step):
+                self._table.append(self._table[-1] * _range_product(k - self.table_step + 1, k + 1))
+        i = min(n // self.table_step, len(self._table) - 1)
+        return i * self.table_step, self._table[i]
+
+    def factorial(self, n):
+        """
+        Факториал числа n (как math_utils.factorial) через кэш.
+
+        :raises ValueError: Если n < 0.
+        """
+        if n < 0:
+            raise ValueError("Factorial is not defined for negative numbers")
+        key = ("factorial", n)
+        value = self._get(key)
+        if value is not None:
+            return value
+        start, value = self._factorial_last
+        if start > n:
+            start, value = 0, 1
+        if n <= self.table_size:
+            k, checkpoint = self._checkpoint(n)
+            if k > start:
+                start, value = k, checkpoint
+        value *= _range_product(start + 1, n + 1)
+        self._factorial_last = (n, value)
+        self._put(key, value)
+        return value
+
+    def fibo(self, n):
+        """
+        n-е число Фибоначчи (как math_utils.fibo) через кэш.
+
+        :raises ValueError: Если n < 0.
+        """
+        if n < 0:
+            raise ValueError("Fibonacci index cannot be negative")
+        key = ("fibo", n)
+        value = self._get(key)
+        if value is not None:
+            return value
+        start, a, b = self._fibo_last
+        if start <= n <= start + _FIBO_STEP_LIMIT:
+            for _ in range(n - start):
+                a, b = b, a + b
+        elif start - _FIBO_STEP_LIMIT <= n < start:
+            # Назад: F(k - 1) = F(k + 1) - F(k)
+            for _ in range(start - n):
+                a, b = b - a, a
+        else:
+            a, b = _fibo_pair(n)
+        self._fibo_last = (n, a, b)
+        self._put(key, a)
+        return a
+
+    def cache_info(self):
+        """Словарь hits, misses, size и maxsize для подбора размера кэша."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        """Очищает LRU и счетчики; таблица факториалов сохраняется."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self._factorial_last = (0, 1)
+        self._fibo_last = (0, 0, 1)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value}" for name, value in self.cache_info().items())
+        return f"MathCache({fields})"
@@ -1,3 +1,6 @@
+import math
+
+
 def factorial(n):
     """
         Вычисление факториала числа n рекурсивно.
@@ -18,15 +21,172 @@ def factorial_recursive(n):
     """
     Вычисление факториала числа n рекурсивно.
 
+    Рекурсия делит отрезок [1, n] пополам, а не отщепляет по одному
+    множителю, поэтому ее глубина - log2(n), и RecursionError не возникает
+    при любом n.
+
     :param n: Неотрицательное целое число.
     :return: Факториал числа n.
     :raises ValueError: Если n < 0.
     """
     if n < 0:
         raise ValueError("Factorial is not defined for negative numbers")
-    if n == 0 or n == 1:
+    return _range_product(1, n + 1)
+
+
+# Отрезки короче этого перемножаются простым циклом: числа в них малы,
+# и дерево дало бы только лишние вызовы
+_PRODUCT_LEAF = 16
+
+
+def _range_product(lo, hi, step=1):
+    """
+    Произведение lo * (lo + step) * ... (< hi) деревом произведений:
+    перемножаются половины близкой длины, поэтому большие числа
+    умножаются на большие (Карацуба в CPython), а не на малые по одному.
+    """
+    count = (hi - lo + step - 1) // step
+    if count <= _PRODUCT_LEAF:
+        result = 1
+        for k in range(lo, hi, step):
+            result *= k
+        return result
+    mid = lo + (count // 2) * step
+    return _range_product(lo, mid, step) * _range_product(mid, hi, step)
+
+
+def _product(values):
+    """Произведение списка чисел деревом произведений (попарно по уровням)."""
+    if not values:
         return 1
-    return n * factorial_recursive(n - 1)
+    while len(values) > 1:
+        paired = [values[i] * values[i + 1] for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+
+def _primes_upto(n):
+    """Простые числа не больше n (решето Эратосфена на bytearray)."""
+    if n < 2:
+        return []
+    sieve = bytearray([1]) * (n + 1)
+    sieve[0] = sieve[1] = 0
+    for p in range(2, int(n ** 0.5) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, n + 1, p)))
+    return [p for p in range(2, n + 1) if sieve[p]]
+
+
+def _swing(n, primes):
+    """
+    "Качание" n = n! / (n//2)!^2: простое p входит в него в степени,
+    равной числу нечетных n // p^k (k >= 1).
+    """
+    factors = []
+    for p in primes:
+        if p > n:
+            break
+        q, e = n, 0
+        while q:
+            q //= p
+            e += q & 1
+        if e:
+            factors.append(p ** e if e > 1 else p)
+    return _product(factors)
+
+
+def factorial_fast(n, method="split"):
+    """
+    Вычисление факториала числа n для больших n.
+
+    "split" - дерево произведений по отрезку [2, n] (binary splitting).
+    "swing" - алгоритм prime swing: n! = (n//2)!^2 * swing(n), где
+    swing(n) собирается из степеней простых; умножений больших чисел
+    меньше, чем в "split", и возведение в квадрат дешевле умножения.
+    Оба метода дают тот же результат, что и factorial, но асимптотически
+    быстрее: последовательное умножение квадратично по числу цифр.
+
+    :param n: Неотрицательное целое число.
+    :param method: "split" или "swing".
+    :return: Факториал числа n.
+    :raises ValueError: Если n < 0 или метод неизвестен.
+    """
+    if n < 0:
+        raise ValueError("Factorial is not defined for negative numbers")
+    if method == "split":
+        return _range_product(2, n + 1)
+    if method != "swing":
+        raise ValueError(f"Unknown factorial method: {method!r}")
+    primes = _primes_upto(n)
+
+    def rec(k):
+        if k < 2:
+            return 1
+        half = rec(k // 2)
+        return half * half * _swing(k, primes)
+
+    return rec(n)
+
+
+def factorial_mod(n, p):
+    """
+    Вычисление n! по модулю p без больших чисел: O(n) умножений чисел
+    меньше p. Если n >= p, то p делит n! и результат 0.
+
+    :param n: Неотрицательное целое число.
+    :param p: Модуль (положительный, не обязательно простой).
+    :return: n! mod p.
+    :raises ValueError: Если n < 0 или p < 1.
+    """
+    if n < 0:
+        raise ValueError("Factorial is not defined for negative numbers")
+    if p < 1:
+        raise ValueError("Modulus must be positive")
+    if n >= p:
+        return 0
+    result = 1 % p
+    for k in range(2, n + 1):
+        result = result * k % p
+    return result
+
+
+def log_factorial(n, base=None):
+    """
+    Логарифм n! через math.lgamma(n + 1) за O(1), без вычисления самого
+    факториала. Относительная точность - как у float.
+
+    :param n: Неотрицательное целое число.
+    :param base: Основание логарифма (по умолчанию натуральный).
+    :return: ln(n!) или log_base(n!).
+    :raises ValueError: Если n < 0.
+    """
+    if n < 0:
+        raise ValueError("Factorial is not defined for negative numbers")
+    value = math.lgamma(n + 1)
+    return value if base is None else value / math.log(base)
+
+
+def factorial_approx(n):
+    """
+    Приближенное значение n! в виде (мантисса, порядок):
+    n! ~ mantissa * 10 ** exponent, 1 <= mantissa < 10. Подходит, когда
+    нужна только величина числа; точность мантиссы падает с ростом
+    порядка (около 1e-9 при n = 10**6).
+
+    :param n: Неотрицательное целое число.
+    :return: Пара (mantissa, exponent).
+    :raises ValueError: Если n < 0.
+    """
+    log10 = log_factorial(n, 10)
+    exponent = math.floor(log10)
+    mantissa = 10 ** (log10 - exponent)
+    # Погрешность float может дать 10.0 на границе порядка
+    if mantissa >= 10:
+        mantissa /= 10
+        exponent += 1
+    return mantissa, exponent
 
 
 def fibo(n):
@@ -49,18 +209,106 @@ def fibo(n):
     return b
 
 
-def fibo_recursive(n):
+def fibo_recursive(n, memo=False):
     """
     Вычисление n-ого числа Фибоначчи рекурсивно.
 
+    Без memo дерево вызовов экспоненциально (n около 35 считается секунды),
+    с memo каждое F(k) вычисляется один раз - O(n) вызовов, но глубина
+    рекурсии по-прежнему n.
+
     :param n: Порядковый номер (неотрицательный).
+    :param memo: Если True, запоминать уже вычисленные значения.
     :return: n-е число Фибоначчи.
     :raises ValueError: Если n < 0.
     """
     if n < 0:
         raise ValueError("Fibonacci index cannot be negative")
+    if memo:
+        cache = {0: 0, 1: 1}
+
+        def rec(k):
+            if k not in cache:
+                cache[k] = rec(k - 1) + rec(k - 2)
+            return cache[k]
+
+        return rec(n)
     if n == 0:
         return 0
     if n == 1:
         return 1
-    return fibo_recursive(n - 1) + fibo_recursive(n - 2)
\ No newline at end of file
+    return fibo_recursive(n - 1) + fibo_recursive(n - 2)
+
+
+def _fibo_pair(n, m=None):
+    """
+    Пара (F(n), F(n+1)) быстрым удвоением по битам n от старшего:
+    F(2k) = F(k) * (2F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2.
+    Если задан m, все вычисления идут по модулю m.
+    """
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if m is not None:
+            c %= m
+            d %= m
+        if bit == "1":
+            a, b = d, c + d
+            if m is not None:
+                b %= m
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fibo_fast(n):
+    """
+    Вычисление n-ого числа Фибоначчи быстрым удвоением:
+    O(log n) умножений больших чисел вместо n сложений.
+
+    :param n: Порядковый номер (неотрицательный).
+    :return: n-е число Фибоначчи.
+    :raises ValueError: Если n < 0.
+    """
+    if n < 0:
+        raise ValueError("Fibonacci index cannot be negative")
+    return _fibo_pair(n)[0]
+
+
+def fibo_mod(n, m):
+    """
+    n-е число Фибоначчи по модулю m за O(log n) операций с числами меньше m^2.
+
+    :param n: Порядковый номер (неотрицательный).
+    :param m: Модуль (положительный).
+    :return: F(n) mod m.
+    :raises ValueError: Если n < 0 или m < 1.
+    """
+    if n < 0:
+        raise ValueError("Fibonacci index cannot be negative")
+    if m < 1:
+        raise ValueError("Modulus must be positive")
+    return _fibo_pair(n, m)[0] % m
+
+
+def fibo_range(start, stop):
+    """
+    Числа Фибоначчи F(start), ..., F(stop - 1): первые два - быстрым
+    удвоением, остальные - сложением соседних, без пересчета с нуля.
+
+    :param start: Первый номер (неотрицательный).
+    :param stop: Номер после последнего (как у range).
+    :return: Список чисел Фибоначчи (пустой, если stop <= start).
+    :raises ValueError: Если start < 0.
+    """
+    if start < 0:
+        raise ValueError("Fibonacci index cannot be negative")
+    result = []
+    if stop <= start:
+        return result
+    a, b = _fibo_pair(start)
+    for _ in range(stop - start):
+        result.append(a)
+        a, b = b, a + b
+    return result
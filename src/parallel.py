@@ -0,0 +1,197 @@
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from src.sorts import merge_sort, quick_sort
+
+# Меньшие входы сортируются в текущем процессе: запуск пула дороже сортировки
+_PARALLEL_THRESHOLD = 100_000
+# Размер выборки для разделителей на одного исполнителя
+_SAMPLE_PER_WORKER = 32
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+# Собственный генератор выборки разделителей: глобальный поток random,
+# который вызывающий код мог засеять, не сдвигается
+_rng = random.Random()
+
+
+def _shared_typecode(keys):
+    """
+    Код типа array для размещения ключей в разделяемой памяти:
+    'q' - все ключи int в пределах 64 бит, 'd' - все ключи float,
+    None - ключи нельзя передать без потери точности или вовсе.
+    """
+    if all(type(k) is int and _INT64_MIN <= k <= _INT64_MAX for k in keys):
+        return 'q'
+    if all(type(k) is float for k in keys):
+        return 'd'
+    return None
+
+
+def _upper_bound(a, x):
+    """Первый индекс в отсортированном a, где a[i] > x."""
+    lo, hi = 0, len(a)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if x < a[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def _allocate(n):
+    """Создает обнуленный блок разделяемой памяти под n 8-байтовых элементов."""
+    return shared_memory.SharedMemory(create=True, size=max(1, n * 8))
+
+
+def _share(values, typecode):
+    """Создает блок разделяемой памяти под len(values) элементов и копирует их."""
+    shm = _allocate(len(values))
+    view = shm.buf.cast(typecode)
+    view[:len(values)] = array(typecode, values)
+    view.release()
+    return shm
+
+
+def _read(name, typecode, segments):
+    """Читает из блока разделяемой памяти срезы segments [(start, end)] в один список."""
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf.cast(typecode)
+    try:
+        values = []
+        for start, end in segments:
+            values.extend(view[start:end].tolist())
+        return values
+    finally:
+        view.release()
+        shm.close()
+
+
+def _write(name, typecode, offset, values):
+    """Записывает values в блок разделяемой памяти начиная с offset."""
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf.cast(typecode)
+    try:
+        view[offset:offset + len(values)] = array(typecode, values)
+    finally:
+        view.release()
+        shm.close()
+
+
+def _sort_chunk(keys_name, index_name, typecode, lo, hi, splitters):
+    """
+    Фаза 1 (в процессе-исполнителе): сортирует свой участок [lo, hi)
+    на месте и возвращает границы корзин внутри отсортированного участка.
+    """
+    keys = _read(keys_name, typecode, [(lo, hi)])
+    if index_name is None:
+        keys = quick_sort(keys)
+    else:
+        pairs = quick_sort(list(zip(keys, _read(index_name, 'q', [(lo, hi)]))))
+        keys = [k for k, _ in pairs]
+        _write(index_name, 'q', lo, [i for _, i in pairs])
+    _write(keys_name, typecode, lo, keys)
+    return [0] + [_upper_bound(keys, s) for s in splitters] + [hi - lo]
+
+
+def _merge_bucket(keys_name, index_name, out_name, typecode, segments, offset):
+    """
+    Фаза 2 (в процессе-исполнителе): собирает корзину из отсортированных
+    участков всех исполнителей, сливает их и пишет в выходной буфер
+    (ключи, а с key - индексы элементов).
+    """
+    keys = _read(keys_name, typecode, segments)
+    if index_name is None:
+        # Участки уже отсортированы: merge_sort сольет готовые серии
+        _write(out_name, typecode, offset, merge_sort(keys))
+    else:
+        pairs = merge_sort(list(zip(keys, _read(index_name, 'q', segments))))
+        _write(out_name, 'q', offset, [i for _, i in pairs])
+
+
+def parallel_sort(a, workers=None, key=None, reverse=False, threshold=_PARALLEL_THRESHOLD):
+    """
+    Параллельная сортировка выборкой (sample sort) на нескольких процессах.
+
+    Разделители берутся из случайной выборки ключей. Каждый исполнитель
+    сортирует свой участок и находит в нем границы корзин, затем каждый
+    исполнитель сливает свою корзину из всех участков. Данные передаются
+    через multiprocessing.shared_memory, а не сериализацией списков.
+    Если ключи не целые 64-битные и не float, сортировка идет в текущем
+    процессе. С key результат устойчив.
+
+    :param a: Список для сортировки.
+    :param workers: Число процессов (по умолчанию os.cpu_count()).
+    :param key: Функция-ключ.
+    :param reverse: Флаг обратной сортировки.
+    :param threshold: Входы короче этого порога сортируются в текущем процессе.
+    :return: Новый отсортированный список.
+    """
+    n = len(a)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, max(1, n))
+    if n < threshold or workers < 2:
+        return merge_sort(a, key=key, reverse=reverse)
+
+    items = list(a)
+    if reverse:
+        items.reverse()
+    keys = items if key is None else [key(x) for x in items]
+    typecode = _shared_typecode(keys)
+    if typecode is None:
+        return merge_sort(a, key=key, reverse=reverse)
+
+    sample = quick_sort(_rng.sample(keys, min(n, workers * _SAMPLE_PER_WORKER)))
+    splitters = []
+    for j in range(1, workers):
+        candidate = sample[j * len(sample) // workers]
+        if not splitters or splitters[-1] < candidate:
+            splitters.append(candidate)
+
+    # С key сортируются пары (ключ, индекс): индекс дает устойчивость и перестановку
+    keyed = key is not None
+    keys_block = _share(keys, typecode)
+    index_block = _share(range(n), 'q') if keyed else None
+    out_block = _allocate(n)
+    blocks = [b for b in (keys_block, index_block, out_block) if b is not None]
+    keys_name = keys_block.name
+    index_name = index_block.name if keyed else None
+    try:
+        bounds = [n * c // workers for c in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk_bounds = list(pool.map(
+                _sort_chunk,
+                [keys_name] * workers, [index_name] * workers, [typecode] * workers,
+                bounds[:-1], bounds[1:], [splitters] * workers))
+
+            # Корзина j - это j-е отрезки всех участков; offset - ее место в выходе
+            segments_list, offsets = [], []
+            offset = 0
+            for j in range(len(splitters) + 1):
+                segments = [(bounds[c] + cb[j], bounds[c] + cb[j + 1])
+                            for c, cb in enumerate(chunk_bounds)]
+                segments_list.append(segments)
+                offsets.append(offset)
+                offset += sum(end - start for start, end in segments)
+            m = len(segments_list)
+            list(pool.map(
+                _merge_bucket,
+                [keys_name] * m, [index_name] * m, [out_block.name] * m,
+                [typecode] * m, segments_list, offsets))
+
+        if keyed:
+            result = [items[i] for i in _read(out_block.name, 'q', [(0, n)])]
+        else:
+            result = _read(out_block.name, typecode, [(0, n)])
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    if reverse:
+        result.reverse()
+    return result
@@ -0,0 +1,230 @@
+import argparse
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Файл результатов по умолчанию (JSON Lines, одна запись на замер)
+DEFAULT_RESULTS_FILE = "bench_results.jsonl"
+
+
+def git_revision():
+    """Текущая ревизия git или "unknown", если git недоступен."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                             text=True, check=True, timeout=10)
+        return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def save_results(results, path=DEFAULT_RESULTS_FILE, revision=None):
+    """
+    Дописывает успешные замеры BenchResult в файл результатов.
+    Каждая запись привязана к алгоритму, набору данных, n, версии Python
+    и ревизии git.
+
+    :param results: Итерируемое BenchResult.
+    :param path: Путь к файлу JSON Lines.
+    :param revision: Ревизия (по умолчанию текущая ревизия git).
+    :return: Количество записанных замеров.
+    """
+    if revision is None:
+        revision = git_revision()
+    python = platform.python_version()
+    timestamp = time.time()
+    count = 0
+    with open(path, "a", encoding="utf-8") as f:
+        for r in results:
+            if not r.ok:
+                continue
+            record = {
+                "algorithm": r.algorithm,
+                "dataset": r.dataset,
+                "n": r.n,
+                "python": python,
+                "revision": revision,
+                "timestamp": timestamp,
+                "samples": r.samples,
+            }
+            f.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+
+def load_results(path=DEFAULT_RESULTS_FILE, revision=None):
+    """
+    Читает записи из файла результатов.
+
+    :param revision: Если задана, только записи этой ревизии (допускается префикс).
+    :return: Список словарей-записей.
+    """
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if revision is None or record["revision"].startswith(revision):
+                records.append(record)
+    return records
+
+
+def _group_samples(records):
+    """Объединяет замеры по ключу (алгоритм, набор, n, версия Python)."""
+    groups = {}
+    for record in records:
+        key = (record["algorithm"], record["dataset"], record["n"], record["python"])
+        groups.setdefault(key, []).extend(record["samples"])
+    return groups
+
+
+def _betacf(a, b, x):
+    """Цепная дробь для неполной бета-функции (метод Лентца)."""
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        for num in (m * (b - m) * x / ((a + m2 - 1) * (a + m2)),
+                    -(a + m) * (a + b + m) * x / ((a + m2) * (a + m2 + 1))):
+            d = 1.0 + num * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + num / c
+            if abs(c) < tiny:
+                c = tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return h
+
+
+def _incomplete_beta(a, b, x):
+    """Регуляризованная неполная бета-функция I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                     + a * math.log(x) + b * math.log(1.0 - x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def welch_t_test(baseline, current):
+    """
+    Односторонний t-тест Уэлча: гипотеза "current медленнее baseline".
+
+    :param baseline: Замеры базовой ревизии.
+    :param current: Замеры текущей ревизии.
+    :return: Пара (t, p): статистика и p-значение.
+    """
+    n1, n2 = len(baseline), len(current)
+    if n1 < 2 or n2 < 2:
+        return 0.0, 1.0
+    v1 = statistics.variance(baseline) / n1
+    v2 = statistics.variance(current) / n2
+    diff = statistics.fmean(current) - statistics.fmean(baseline)
+    if v1 + v2 == 0:
+        return (math.inf, 0.0) if diff > 0 else (0.0, 1.0)
+    t = diff / math.sqrt(v1 + v2)
+    df = (v1 + v2) ** 2 / (v1 ** 2 / (n1 - 1) + v2 ** 2 / (n2 - 1))
+    # P(T > t) через неполную бета-функцию
+    tail = 0.5 * _incomplete_beta(df / 2, 0.5, df / (df + t * t))
+    p = tail if t > 0 else 1.0 - tail
+    return t, p
+
+
+def compare(baseline_records, current_records, threshold=0.05, alpha=0.05):
+    """
+    Сравнивает замеры двух ревизий по совпадающим ключам
+    (алгоритм, набор, n, версия Python).
+
+    Замедление считается регрессией, если медиана выросла больше чем на
+    threshold (доля) и t-тест Уэлча значим на уровне alpha.
+
+    :return: Пара (regressions, compared): список словарей с описанием
+             регрессий и количество сравненных ключей.
+    """
+    baseline = _group_samples(baseline_records)
+    current = _group_samples(current_records)
+    regressions = []
+    compared = 0
+    for key, cur_samples in current.items():
+        base_samples = baseline.get(key)
+        if not base_samples:
+            continue
+        compared += 1
+        base_median = statistics.median(base_samples)
+        cur_median = statistics.median(cur_samples)
+        ratio = cur_median / base_median if base_median > 0 else math.inf
+        t, p = welch_t_test(base_samples, cur_samples)
+        if ratio > 1.0 + threshold and p < alpha:
+            algorithm, dataset, n, python = key
+            regressions.append({
+                "algorithm": algorithm, "dataset": dataset, "n": n, "python": python,
+                "baseline_median": base_median, "current_median": cur_median,
+                "ratio": ratio, "t": t, "p": p,
+            })
+    return regressions, compared
+
+
+def add_compare_arguments(parser):
+    """Добавляет в parser аргументы команды compare."""
+    parser.add_argument("results", nargs="?", default=DEFAULT_RESULTS_FILE,
+                        help="файл результатов (JSON Lines)")
+    parser.add_argument("--baseline", required=True, help="базовая ревизия (или префикс)")
+    parser.add_argument("--current", help="сравниваемая ревизия (по умолчанию HEAD)")
+    parser.add_argument("--baseline-file", help="отдельный файл с базовыми замерами")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="допустимое замедление медианы (доля, по умолчанию 0.05)")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                        help="уровень значимости t-теста (по умолчанию 0.05)")
+
+
+def run_compare(args):
+    """
+    Выполняет команду compare по разобранным аргументам.
+
+    :return: Код возврата: 0 - регрессий нет, 1 - найдены регрессии,
+             2 - нечего сравнивать (нет общих замеров).
+    """
+    current_rev = args.current or git_revision()
+    baseline_records = load_results(args.baseline_file or args.results, args.baseline)
+    current_records = load_results(args.results, current_rev)
+    regressions, compared = compare(baseline_records, current_records,
+                                    args.threshold, args.alpha)
+    if compared == 0:
+        print(f"Нет общих замеров для ревизий {args.baseline} и {current_rev}")
+        return 2
+    for r in regressions:
+        print(f"REGRESSION {r['algorithm']} / {r['dataset']} n={r['n']} (Python {r['python']}): "
+              f"{r['baseline_median']:.6f} -> {r['current_median']:.6f} sec "
+              f"(x{r['ratio']:.2f}, p={r['p']:.4f})")
+    print(f"Сравнено: {compared}, регрессий: {len(regressions)}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    """
+    Командная строка: python -m src.results_store compare RESULTS --baseline REV
+
+    Код возврата: 0 - регрессий нет, 1 - найдены регрессии,
+    2 - нечего сравнивать (нет общих замеров).
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.results_store",
+                                     description="Хранилище результатов бенчмарков")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmp_parser = sub.add_parser("compare", help="поиск регрессий относительно базовой ревизии")
+    add_compare_arguments(cmp_parser)
+    return run_compare(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,245 +1,1124 @@
-def bubble_sort(a, key=None, reverse=False):
+import math
+import random
+import warnings
+from array import array
+
+from src import backends
+
+# Конструктор рабочего массива ядер. Режим подсчета операций
+# (src.instrument) временно подменяет его списком, считающим записи.
+_work_list = list
+
+# Собственный генератор выборок bucket_sort: глобальный поток random,
+# который вызывающий код мог засеять, не сдвигается
+_rng = random.Random()
+
+
+# Коды типа числовых элементов буферов (array.typecodes без символьных)
+_NUMERIC_TYPECODES = frozenset('bBhHiIlLqQfd')
+
+
+def _buffer_typecode(a):
     """
-    Сортировка пузырьком (Bubble Sort).
+    Код типа элементов буфера: array, одномерный memoryview числового
+    формата, bytes или bytearray ('B'). Для прочих последовательностей None.
 
-    :param a: Список для сортировки.
-    :param key: Функция-ключ для сравнения элементов (опционально).
-    :param reverse: Если True, сортирует в убывающем порядке.
-    :return: Новый отсортированный список.
+    :raises ValueError: Если формат memoryview не поддерживается.
+    """
+    if isinstance(a, array):
+        return a.typecode
+    if isinstance(a, (bytes, bytearray)):
+        return 'B'
+    if isinstance(a, memoryview):
+        fmt = a.format.lstrip('@')
+        if a.ndim != 1 or fmt not in _NUMERIC_TYPECODES:
+            raise ValueError(f"Unsupported buffer format {a.format!r}")
+        return fmt
+    return None
+
+
+def _like(a, values):
+    """Значения values в контейнере того же типа, что и буфер a (список - как есть)."""
+    if isinstance(a, array):
+        if isinstance(values, array) and values.typecode == a.typecode:
+            return values
+        return array(a.typecode, values)
+    if isinstance(a, (bytes, bytearray)):
+        return type(a)(values)
+    if isinstance(a, memoryview):
+        typecode = _buffer_typecode(a)
+        if not (isinstance(values, array) and values.typecode == typecode):
+            values = array(typecode, values)
+        return memoryview(values)
+    return values
+
+
+def _sort_with_keys(core, a, key=None, reverse=False, inplace=False):
     """
-    arr = a.copy()
-    key_func = key if key else lambda x: x
+    Общий слой предвычисления ключей (decorate-sort-undecorate).
+
+    Функция-ключ вызывается ровно один раз на элемент, после чего ядро
+    сортирует пары (ключ, индекс). Индекс разрешает равенство ключей,
+    поэтому результат с key устойчив для любого ядра.
+    Обратный порядок получается так же, как во встроенной сортировке:
+    вход разворачивается, сортируется по возрастанию и разворачивается обратно.
+
+    Буферы (array, memoryview, bytes, bytearray) возвращаются в контейнере
+    того же типа. Без inplace ядро работает со списком чисел: обращение к
+    элементу списка не упаковывает число заново, это примерно вдвое быстрее.
+    С inplace array и bytearray сортируются прямо в своей памяти
+    (8 байт на элемент и меньше), memoryview - через список с записью обратно.
+
+    :param core: Функция, сортирующая список на месте по возрастанию.
+    :param a: Исходная последовательность (не изменяется, если не inplace).
+    :param key: Функция-ключ (опционально).
+    :param reverse: Если True, результат в убывающем порядке.
+    :param inplace: Если True, сортирует сам a без копии.
+    :return: Новый отсортированный список или буфер типа a (или a при inplace).
+    """
+    typecode = _buffer_typecode(a)
+    if typecode is not None and not (inplace and isinstance(a, (array, bytearray))):
+        values = a.tolist() if hasattr(a, "tolist") else list(a)
+        result = _sort_with_keys(core, values, key, reverse, inplace=True)
+        return _store(a, result, inplace)
+
+    arr = a if inplace else _work_list(a)
+    if reverse:
+        arr.reverse()
+    if key is None:
+        core(arr)
+    else:
+        pairs = [(key(x), i) for i, x in enumerate(arr)]
+        if _work_list is not list:
+            pairs = _work_list(pairs)
+        core(pairs)
+        ordered = _like(arr, [arr[i] for _, i in pairs])
+        if inplace:
+            arr[:] = ordered
+        else:
+            arr = ordered
+    if reverse:
+        arr.reverse()
+    return arr
+
+
+def _store(a, result, inplace):
+    """
+    Для сортировок не на месте: результат приводится к типу буфера a,
+    при inplace копируется обратно в a.
+    """
+    result = _like(a, result)
+    if inplace:
+        a[:] = result
+        return a
+    return result
+
+
+def _bubble_core(arr):
+    """Пузырьковая сортировка списка на месте по возрастанию."""
     n = len(arr)
     for i in range(n):
         swapped = False
         for j in range(0, n - i - 1):
-            left = key_func(arr[j])
-            right = key_func(arr[j + 1])
-            if (left > right) if not reverse else (left < right):
+            if arr[j] > arr[j + 1]:
                 arr[j], arr[j + 1] = arr[j + 1], arr[j]
                 swapped = True
         if not swapped:
             break
-    return arr
 
 
-def quick_sort(a, key=None, reverse=False):
+def bubble_sort(a, key=None, reverse=False, inplace=False):
+    """
+    Сортировка пузырьком (Bubble Sort).
+
+    :param a: Список для сортировки.
+    :param key: Функция-ключ для сравнения элементов (опционально).
+    :param reverse: Если True, сортирует в убывающем порядке.
+    :param inplace: Если True, сортирует сам список a вместо копии.
+    :return: Новый отсортированный список (или a при inplace=True).
+    """
+    return _sort_with_keys(_bubble_core, a, key, reverse, inplace)
+
+
+# Срезы не длиннее этого порога досортировываются вставками
+_INSERTION_THRESHOLD = 16
+
+
+def _insertion_core(arr, lo, hi):
+    """Сортировка вставками среза arr[lo:hi + 1] на месте по возрастанию."""
+    for i in range(lo + 1, hi + 1):
+        x = arr[i]
+        j = i - 1
+        while j >= lo and arr[j] > x:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = x
+
+
+def _partition3(arr, lo, hi):
+    """
+    Трехпутевое разбиение (Dutch national flag) среза arr[lo:hi + 1].
+    Опорный элемент выбирается медианой трех.
+
+    :return: Пара (lt, gt): arr[lt:gt + 1] равны опорному,
+             слева от lt - меньшие, справа от gt - большие.
+    """
+    mid = (lo + hi) // 2
+
+    # Медиана трех для выбора pivot
+    if arr[lo] > arr[mid]:
+        arr[lo], arr[mid] = arr[mid], arr[lo]
+    if arr[lo] > arr[hi]:
+        arr[lo], arr[hi] = arr[hi], arr[lo]
+    if arr[mid] > arr[hi]:
+        arr[mid], arr[hi] = arr[hi], arr[mid]
+
+    pivot = arr[mid]
+    lt, i, gt = lo, lo, hi
+    while i <= gt:
+        x = arr[i]
+        if x < pivot:
+            arr[lt], arr[i] = x, arr[lt]
+            lt += 1
+            i += 1
+        elif pivot < x:
+            arr[i], arr[gt] = arr[gt], x
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+
+def _intro_core(arr, lo=0, hi=None):
+    """
+    Интроспективная сортировка среза arr[lo:hi + 1] на месте по возрастанию.
+
+    Рекурсии нет: меньшая часть разбиения обрабатывается сразу, большая
+    откладывается на явный стек, поэтому стек не глубже O(log n).
+    При превышении глубины 2*log2(n) срез досортировывается кучей.
+    """
+    if hi is None:
+        hi = len(arr) - 1
+    stack = [(lo, hi, 2 * (hi - lo + 1).bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo >= _INSERTION_THRESHOLD:
+            if depth == 0:
+                _heap_core(arr, lo, hi + 1)
+                lo = hi
+                break
+            depth -= 1
+            lt, gt = _partition3(arr, lo, hi)
+            if lt - lo < hi - gt:
+                stack.append((gt + 1, hi, depth))
+                hi = lt - 1
+            else:
+                stack.append((lo, lt - 1, depth))
+                lo = gt + 1
+        _insertion_core(arr, lo, hi)
+
+
+def quick_sort(a, key=None, reverse=False, inplace=False):
     """
-    Быстрая сортировка (Quick Sort).
-    Использует оптимизацию "медиана трех" для выбора опорного элемента.
+    Быстрая сортировка (Quick Sort) в варианте introsort.
+    Опорный элемент - "медиана трех", разбиение трехпутевое (устойчиво
+    к дубликатам), малые срезы сортируются вставками, а при вырождении
+    разбиения срез досортировывается кучей, так что худший случай O(n log n).
 
     :param a: Список для сортировки.
     :param key: Функция-ключ для сравнения.
     :param reverse: Если True, сортирует по убыванию.
-    :return: Новый отсортированный список.
-    """
-    arr = a.copy()
-    if len(arr) <= 1:
-        return arr
-    key_func = key if key else lambda x: x
-
-    def partition(low, high):
-        mid = (low + high) // 2
-        l_val = key_func(arr[low])
-        m_val = key_func(arr[mid])
-        h_val = key_func(arr[high])
-
-        # Медиана трех для выбора pivot
-        if l_val > m_val:
-            arr[low], arr[mid] = arr[mid], arr[low]
-            l_val, m_val = m_val, l_val
-        if l_val > h_val:
-            arr[low], arr[high] = arr[high], arr[low]
-            l_val, h_val = h_val, l_val
-        if m_val > h_val:
-            arr[mid], arr[high] = arr[high], arr[mid]
-
-        pivot_val = key_func(arr[high])
-        i = low - 1
-
-        condition = (lambda x: x <= pivot_val) if not reverse else (lambda x: x >= pivot_val)
-
-        for j in range(low, high):
-            if condition(key_func(arr[j])):
+    :param inplace: Если True, сортирует сам список a вместо копии.
+    :return: Новый отсортированный список (или a при inplace=True).
+    """
+    return _sort_with_keys(_intro_core, a, key, reverse, inplace)
+
+
+# Параметры сортировки естественными сериями (TimSort)
+_MIN_MERGE = 64
+_MIN_GALLOP = 7
+
+
+def _min_run_length(n):
+    """Минимальная длина серии: n / minrun близко к степени двойки, сверху."""
+    r = 0
+    while n >= _MIN_MERGE:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def _binary_insertion(arr, lo, hi, start):
+    """
+    Бинарные вставки: arr[lo:start] уже отсортирован,
+    элементы arr[start:hi] вставляются в него устойчиво.
+    """
+    for i in range(start, hi):
+        x = arr[i]
+        left, right = lo, i
+        while left < right:
+            mid = (left + right) // 2
+            if x < arr[mid]:
+                right = mid
+            else:
+                left = mid + 1
+        arr[left + 1:i + 1] = arr[left:i]
+        arr[left] = x
+
+
+def _count_run(arr, lo, hi):
+    """
+    Длина естественной серии, начинающейся с arr[lo].
+    Строго убывающая серия разворачивается на месте (строгость
+    нужна для устойчивости).
+    """
+    run_hi = lo + 1
+    if run_hi == hi:
+        return 1
+    if arr[run_hi] < arr[lo]:
+        while run_hi + 1 < hi and arr[run_hi + 1] < arr[run_hi]:
+            run_hi += 1
+        run_hi += 1
+        arr[lo:run_hi] = arr[lo:run_hi][::-1]
+    else:
+        while run_hi + 1 < hi and not arr[run_hi + 1] < arr[run_hi]:
+            run_hi += 1
+        run_hi += 1
+    return run_hi - lo
+
+
+def _gallop_right(x, a, lo, hi):
+    """
+    Галоп вправо: первый индекс i в отсортированном a[lo:hi], где a[i] > x.
+    Экспоненциальный поиск от lo, затем бинарный.
+    """
+    prev, cur, step = lo, lo, 1
+    while cur < hi and not x < a[cur]:
+        prev = cur + 1
+        cur = lo + step
+        step <<= 1
+    if cur > hi:
+        cur = hi
+    while prev < cur:
+        mid = (prev + cur) // 2
+        if x < a[mid]:
+            cur = mid
+        else:
+            prev = mid + 1
+    return prev
+
+
+def _gallop_left(x, a, lo, hi):
+    """
+    Галоп влево: первый индекс i в отсортированном a[lo:hi], где a[i] >= x.
+    Экспоненциальный поиск от lo, затем бинарный.
+    """
+    prev, cur, step = lo, lo, 1
+    while cur < hi and a[cur] < x:
+        prev = cur + 1
+        cur = lo + step
+        step <<= 1
+    if cur > hi:
+        cur = hi
+    while prev < cur:
+        mid = (prev + cur) // 2
+        if a[mid] < x:
+            prev = mid + 1
+        else:
+            cur = mid
+    return prev
+
+
+def _merge_lo(arr, lo, mid, hi):
+    """
+    Устойчивое слияние соседних серий arr[lo:mid] и arr[mid:hi].
+    Левая серия копируется во временный буфер. Когда одна из серий
+    выигрывает _MIN_GALLOP раз подряд, слияние переходит в режим галопа
+    и переносит целые блоки срезами.
+    """
+    left = arr[lo:mid]
+    n_left = len(left)
+    i, j, k = 0, mid, lo
+    while i < n_left and j < hi:
+        # Обычный режим: поэлементное слияние
+        count_l = count_r = 0
+        while i < n_left and j < hi:
+            if arr[j] < left[i]:
+                arr[k] = arr[j]
+                j += 1
+                count_r += 1
+                count_l = 0
+            else:
+                arr[k] = left[i]
                 i += 1
-                arr[i], arr[j] = arr[j], arr[i]
-        arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        return i + 1
+                count_l += 1
+                count_r = 0
+            k += 1
+            if count_l >= _MIN_GALLOP or count_r >= _MIN_GALLOP:
+                break
 
-    def _quick_sort(low, high):
-        if low < high:
-            pi = partition(low, high)
-            _quick_sort(low, pi - 1)
-            _quick_sort(pi + 1, high)
+        # Режим галопа: пока блоки остаются длинными
+        while i < n_left and j < hi:
+            pos = _gallop_right(arr[j], left, i, n_left)
+            count_l = pos - i
+            arr[k:k + count_l] = left[i:pos]
+            k += count_l
+            i = pos
+            if i == n_left:
+                break
+            pos = _gallop_left(left[i], arr, j, hi)
+            count_r = pos - j
+            arr[k:k + count_r] = arr[j:pos]
+            k += count_r
+            j = pos
+            if count_l < _MIN_GALLOP and count_r < _MIN_GALLOP:
+                break
 
-    _quick_sort(0, len(arr) - 1)
-    return arr
+    # Хвост правой серии уже на месте, переносим остаток левой
+    arr[k:k + n_left - i] = left[i:]
+
+
+def _merge_at(arr, runs, idx):
+    """Сливает серии runs[idx] и runs[idx + 1] (пары (начало, длина))."""
+    base_a, len_a = runs[idx]
+    base_b, len_b = runs[idx + 1]
+    runs[idx] = (base_a, len_a + len_b)
+    del runs[idx + 1]
+
+    # Начало A, не превосходящее B[0], и хвост B, не меньший A[-1], уже на месте
+    start = _gallop_right(arr[base_b], arr, base_a, base_b)
+    if start == base_b:
+        return
+    end = _gallop_left(arr[base_b - 1], arr, base_b, base_b + len_b)
+    _merge_lo(arr, start, base_b, end)
+
+
+def _merge_collapse(arr, runs):
+    """Поддерживает инварианты стека серий TimSort, сливая соседние серии."""
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if (n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or (
+                n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]):
+            if runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+        elif runs[n][1] > runs[n + 1][1]:
+            break
+        _merge_at(arr, runs, n)
 
 
-def counting_sort(a, reverse=False):
+def _run_core(arr):
+    """Сортировка естественными сериями (TimSort) списка на месте по возрастанию."""
+    n = len(arr)
+    if n < 2:
+        return
+    min_run = _min_run_length(n)
+    runs = []
+    lo = 0
+    while lo < n:
+        run_len = _count_run(arr, lo, n)
+        if run_len < min_run:
+            # Короткая серия добирается до min_run бинарными вставками
+            forced = min(min_run, n - lo)
+            _binary_insertion(arr, lo, lo + forced, lo + run_len)
+            run_len = forced
+        runs.append((lo, run_len))
+        _merge_collapse(arr, runs)
+        lo += run_len
+
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+            n -= 1
+        _merge_at(arr, runs, n)
+
+
+def merge_sort(a, key=None, reverse=False, inplace=False):
+    """
+    Сортировка слиянием естественных серий (TimSort).
+    Находит готовые возрастающие и убывающие серии, дополняет короткие
+    бинарными вставками и сливает их с галопом. Устойчива; на уже
+    отсортированных и обратно отсортированных данных работает за O(n).
+
+    :param a: Список для сортировки.
+    :param key: Функция-ключ.
+    :param reverse: Флаг обратной сортировки.
+    :param inplace: Если True, сортирует сам список a вместо копии.
+    :return: Новый отсортированный список (или a при inplace=True).
+    """
+    return _sort_with_keys(_run_core, a, key, reverse, inplace)
+
+
+# Плотная таблица счетчиков используется, пока диапазон значений
+# не превышает _COUNTING_DENSE_FACTOR * n + _COUNTING_DENSE_SLACK;
+# для более разреженных данных строится гистограмма по словарю.
+_COUNTING_DENSE_FACTOR = 4
+_COUNTING_DENSE_SLACK = 1024
+
+
+def counting_sort(a, key=None, reverse=False, inplace=False):
     """
     Сортировка подсчетом (Counting Sort).
     Поддерживает отрицательные числа путем сдвига индексов.
 
-    :param a: Список целых чисел.
-    :param reverse: Если True, возвращает перевернутый список.
-    :return: Новый отсортированный список.
+    Память ограничена: при узком диапазоне счетчики хранятся в array('q'),
+    при широком (например, 0 и 10^9) - в словаре, и упорядочиваются
+    только различные ключи. С key записи раскладываются устойчиво.
+    Без key при бэкенде "numpy" (src.backends) счетчики векторизованы.
+
+    :param a: Список целых чисел (или записей, если задан key).
+    :param key: Функция, возвращающая целочисленный ключ записи.
+    :param reverse: Если True, сортирует по убыванию.
+    :param inplace: Если True, результат записывается обратно в a
+                    (вспомогательная память та же, копия не возвращается).
+    :return: Новый отсортированный список (или a при inplace=True).
     """
     if not a:
-        return []
-    min_val = min(a)
-    max_val = max(a)
-    range_val = max_val - min_val + 1
-    count = [0] * range_val
-    output = [0] * len(a)
-
-    for number in a:
-        count[number - min_val] += 1
-    for i in range(1, len(count)):
-        count[i] += count[i - 1]
-    for i in range(len(a) - 1, -1, -1):
-        output[count[a[i] - min_val] - 1] = a[i]
-        count[a[i] - min_val] -= 1
+        return a if inplace else _like(a, [])
+    if key is None and backends.numpy_enabled(len(a)):
+        result = backends.counting_sort(a, reverse)
+        if result is not None:
+            return _store(a, result, inplace)
+    keys = a if key is None else [key(x) for x in a]
+    n = len(keys)
+    min_val = min(keys)
+    range_val = max(keys) - min_val + 1
 
-    if reverse:
-        output.reverse()
-    return output
+    if range_val <= _COUNTING_DENSE_FACTOR * n + _COUNTING_DENSE_SLACK:
+        shift = min_val
+        count = array('q', bytes(8 * range_val))
+        for k in keys:
+            count[k - shift] += 1
+        slots = range(range_val - 1, -1, -1) if reverse else range(range_val)
+        order = [(slot + shift, slot) for slot in slots if count[slot]]
+    else:
+        shift = 0
+        count = {}
+        for k in keys:
+            count[k] = count.get(k, 0) + 1
+        # Ключи сортируются чистым Python: векторный бэкенд здесь не нужен
+        distinct = _radix_ints(list(count))
+        if reverse:
+            distinct.reverse()
+        order = [(k, k) for k in distinct]
+
+    if key is None:
+        # Значения восстанавливаются прямо из счетчиков (для буфера - без списка)
+        typecode = _buffer_typecode(a)
+        output = [] if typecode is None else array(typecode)
+        for value, slot in order:
+            if isinstance(output, array):
+                output.extend(array(output.typecode, (value,)) * count[slot])
+            else:
+                output.extend([value] * count[slot])
+        return _store(a, output, inplace)
 
+    # Начальная позиция каждого ключа, затем устойчивая раскладка записей
+    # (shift переводит ключ в индекс таблицы счетчиков)
+    pos = 0
+    for _, slot in order:
+        c = count[slot]
+        count[slot] = pos
+        pos += c
+    output = [None] * n
+    for x, k in zip(a, keys):
+        slot = k - shift
+        output[count[slot]] = x
+        count[slot] += 1
+    return _store(a, output, inplace)
 
-def counting_sort_for_radix(arr, exp, base):
+
+# Знаковый бит и маска 64-битного беззнакового слова (ключи radix_sort)
+_SIGN_BIT = 1 << 63
+_UINT64_MASK = (1 << 64) - 1
+
+
+def _float_to_keys(values):
     """
-    Вспомогательная функция для Radix Sort. Сортирует по разряду exp.
+    Стандартное преобразование IEEE-754 double в беззнаковые 64-битные
+    ключи, порядок которых совпадает с порядком чисел: у неотрицательных
+    выставляется знаковый бит, у отрицательных инвертируются все биты.
     """
-    n = len(arr)
-    output = [0] * n
-    count = [0] * base
-    for i in range(n):
-        index = (arr[i] // exp) % base
-        count[index] += 1
-    for i in range(1, base):
-        count[i] += count[i - 1]
-    for i in range(n - 1, -1, -1):
-        index = (arr[i] // exp) % base
-        output[count[index] - 1] = arr[i]
-        count[index] -= 1
-    for i in range(n):
-        arr[i] = output[i]
+    if not (isinstance(values, array) and values.typecode == 'd'):
+        values = array('d', values)
+    keys = array('Q')
+    keys.frombytes(values.tobytes())
+    for i, u in enumerate(keys):
+        keys[i] = (u ^ _UINT64_MASK) if u & _SIGN_BIT else (u | _SIGN_BIT)
+    return keys
+
+
+def _keys_to_float(keys):
+    """Обратное к _float_to_keys преобразование (изменяет keys), результат - array('d')."""
+    for i, u in enumerate(keys):
+        keys[i] = (u ^ _SIGN_BIT) if u & _SIGN_BIT else (u ^ _UINT64_MASK)
+    values = array('d')
+    values.frombytes(keys.tobytes())
+    return values
+
+
+def _radix_passes(keys, bits, width):
+    """
+    LSD-проходы по цифрам из bits бит (сдвиг и маска) для неотрицательных
+    ключей шириной width бит. Два буфера меняются ролями между проходами;
+    проход пропускается, если у всех ключей одна и та же цифра.
+
+    :return: Буфер с отсортированными ключами (keys или второй буфер).
+    """
+    n = len(keys)
+    mask = (1 << bits) - 1
+    src = keys
+    if isinstance(keys, array):
+        dst = array(keys.typecode, bytes(keys.itemsize * n))
+    else:
+        dst = [0] * n
+
+    for shift in range(0, width, bits):
+        count = [0] * (mask + 1)
+        for k in src:
+            count[(k >> shift) & mask] += 1
+        if count[(src[0] >> shift) & mask] == n:
+            continue
 
+        # Позиции начала каждой цифры в выходном буфере
+        pos = 0
+        for digit in range(mask + 1):
+            c = count[digit]
+            count[digit] = pos
+            pos += c
+        for k in src:
+            digit = (k >> shift) & mask
+            dst[count[digit]] = k
+            count[digit] += 1
+        src, dst = dst, src
+    return src
 
-def radix_sort(a, base=10, reverse=False):
+
+def _radix_ints(values, bits=8):
+    """LSD-сортировка списка целых чисел (сдвиг на минимум); новый список."""
+    min_val = min(values)
+    span = max(values) - min_val
+    if span <= _UINT64_MASK:
+        keys = array('Q', [x - min_val for x in values])
+    else:
+        keys = [x - min_val for x in values]
+    keys = _radix_passes(keys, bits, span.bit_length())
+    return [k + min_val for k in keys]
+
+
+def radix_sort(a, bits=None, reverse=False, inplace=False, base=None):
     """
-    Поразрядная сортировка (Radix Sort).
-    Работает только с неотрицательными целыми числами.
+    Поразрядная сортировка (Radix Sort), LSD по цифрам из bits бит.
+
+    Целые числа сдвигаются на минимум (отрицательные поддерживаются),
+    числа с плавающей точкой переводятся в ключи через битовое
+    представление IEEE-754 (int в таком списке приводятся к float).
+    Если ключи помещаются в 64 бита, они хранятся в array('Q').
+    При бэкенде "numpy" (src.backends) цифры извлекаются векторно.
 
-    :param a: Список неотрицательных целых чисел.
-    :param base: Основание системы счисления (по умолчанию 10).
+    :param a: Список целых чисел или чисел с плавающей точкой.
+    :param bits: Ширина цифры в битах (по умолчанию 8, не больше 16).
     :param reverse: Если True, возвращает перевернутый список.
-    :return: Новый отсортированный список.
-    :raises ValueError: Если в списке есть отрицательные числа.
+    :param inplace: Если True, результат записывается обратно в a.
+    :param base: Устарел, используйте bits. Основание заменяется на
+        ближайшую сверху степень двойки (base=10 - 4 бита, не больше 16);
+        результат от основания не зависит.
+    :return: Новый отсортированный список (или a при inplace=True).
+    :raises ValueError: Если bits вне диапазона [1, 16] или base < 2.
+    :raises TypeError: Если заданы и bits, и base.
     """
+    if base is not None:
+        if bits is not None:
+            raise TypeError("radix_sort() got both 'bits' and deprecated 'base'")
+        warnings.warn("radix_sort(base=...) is deprecated: digits are now bit groups, "
+                      "pass bits=... instead", DeprecationWarning, stacklevel=2)
+        if base < 2:
+            raise ValueError("Radix base must be at least 2")
+        bits = min(16, (base - 1).bit_length())
+    elif bits is None:
+        bits = 8
+    if not 1 <= bits <= 16:
+        raise ValueError("Radix digit width must be between 1 and 16 bits")
     if not a:
-        return []
-    if min(a) < 0:
-        raise ValueError("Radix sort supports only non-negative integers")
+        return a if inplace else _like(a, [])
+    if backends.numpy_enabled(len(a)):
+        result = backends.radix_sort(a, bits, reverse)
+        if result is not None:
+            return _store(a, result, inplace)
 
-    arr = a.copy()
-    max_val = max(arr)
-    exp = 1
-    while max_val // exp > 0:
-        counting_sort_for_radix(arr, exp, base)
-        exp *= base
+    typecode = _buffer_typecode(a)
+    typed = typecode is not None
+    if typecode in ('f', 'd') if typed else any(isinstance(x, float) for x in a):
+        keys = _radix_passes(_float_to_keys(a), bits, 64)
+        result = _keys_to_float(keys)
+        if not typed:
+            result = result.tolist()
+    elif typed:
+        # Ключи и результат строятся без промежуточного списка
+        min_val = min(a)
+        keys = array('Q', (x - min_val for x in a))
+        keys = _radix_passes(keys, bits, (max(a) - min_val).bit_length())
+        result = array(typecode, (k + min_val for k in keys))
+    else:
+        result = _radix_ints(a, bits)
 
     if reverse:
-        arr.reverse()
-    return arr
+        result.reverse()
+    return _store(a, result, inplace)
+
 
+# Параметры корзинной сортировки: целевой размер корзины, верхняя граница
+# числа корзин, размер выборки на корзину, допустимое переполнение
+# корзины относительно среднего и глубина рекурсивного дробления.
+_BUCKET_TARGET_SIZE = 32
+_MAX_BUCKETS = 1024
+_BUCKET_OVERSAMPLE = 8
+_BUCKET_OVERFLOW = 4
+_BUCKET_MAX_DEPTH = 4
+
+
+def _bucket_index(splitters, x):
+    """Номер корзины для x: число разделителей, не превосходящих x."""
+    lo, hi = 0, len(splitters)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if x < splitters[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def _empty_buckets(arr, count):
+    """count пустых корзин того же типа, что и массив: array пишется обратно срезом."""
+    if isinstance(arr, array):
+        return [array(arr.typecode) for _ in range(count)]
+    # Корзины - рабочие массивы: в режиме подсчета операций
+    # (src.instrument) записи в них тоже считаются
+    return [_work_list() for _ in range(count)]
+
+
+def _arithmetic_buckets(arr, buckets):
+    """
+    Раскладка чисел по buckets корзинам равной ширины: номер корзины
+    вычисляется по значению за O(1), без сравнений.
 
-def bucket_sort(a, buckets=None, key=None, reverse=False):
+    :return: Список корзин или None, если элементы не только int/float,
+             диапазон пуст или не конечен, либо данные перекошены
+             (в какой-то корзине больше _BUCKET_OVERFLOW средних).
+    """
+    if not isinstance(arr, array) and not all(type(x) is int or type(x) is float for x in arr):
+        return None
+    lo = min(arr)
+    try:
+        span = max(arr) - lo
+        if not 0 < span < math.inf:
+            return None
+        buckets_list = _empty_buckets(arr, buckets)
+        last = buckets - 1
+        if type(span) is int:
+            # Целые - точной арифметикой: числа за пределами float не теряют порядок
+            width = span + 1
+            for x in arr:
+                buckets_list[(x - lo) * buckets // width].append(x)
+        else:
+            scale = buckets / span
+            for x in arr:
+                i = int((x - lo) * scale)
+                buckets_list[i if i < last else last].append(x)
+    except OverflowError:
+        return None
+    limit = _BUCKET_OVERFLOW * len(arr) // buckets
+    if any(len(bucket) > limit for bucket in buckets_list):
+        return None
+    return buckets_list
+
+
+def _sampled_buckets(arr, buckets):
+    """
+    Раскладка по корзинам с границами-квантилями случайной выборки:
+    перекос данных не собирает все элементы в одну корзину, но номер
+    корзины ищется двоичным поиском по разделителям.
+
+    :return: Список корзин или None, если выборка из одинаковых значений.
+    """
+    n = len(arr)
+    picks = _rng.sample(range(n), min(n, buckets * _BUCKET_OVERSAMPLE))
+    sample = _work_list([arr[i] for i in picks])
+    _intro_core(sample)
+    if not sample[0] < sample[-1]:
+        return None
+
+    # Квантили выборки; повторяющиеся разделители отбрасываются
+    splitters = []
+    step = len(sample) / buckets
+    for j in range(1, buckets):
+        candidate = sample[int(j * step)]
+        if not splitters or splitters[-1] < candidate:
+            splitters.append(candidate)
+
+    buckets_list = _empty_buckets(arr, len(splitters) + 1)
+    for item in arr:
+        buckets_list[_bucket_index(splitters, item)].append(item)
+    return buckets_list
+
+
+def _bucket_core(arr, buckets=None, depth=0):
+    """
+    Корзинная сортировка списка на месте по возрастанию.
+
+    Числа раскладываются по корзинам равной ширины арифметически (O(N + K)
+    при равномерных данных). Если элементы не числа или корзины
+    перекошены, границы корзин - квантили случайной выборки. Маленькие
+    корзины сортируются вставками, большие - introsort, переполненные
+    дробятся рекурсивно.
+    """
+    n = len(arr)
+    if n <= _INSERTION_THRESHOLD:
+        _insertion_core(arr, 0, n - 1)
+        return
+    if buckets is None:
+        buckets = min(max(1, n // _BUCKET_TARGET_SIZE), _MAX_BUCKETS)
+
+    buckets_list = _arithmetic_buckets(arr, buckets)
+    if buckets_list is None:
+        buckets_list = _sampled_buckets(arr, buckets)
+    if buckets_list is None:
+        # Выборка из одинаковых значений: трехпутевое разбиение справится за O(n)
+        _intro_core(arr)
+        return
+
+    limit = _BUCKET_OVERFLOW * n // len(buckets_list)
+    pos = 0
+    for bucket in buckets_list:
+        size = len(bucket)
+        if size <= _INSERTION_THRESHOLD:
+            _insertion_core(bucket, 0, size - 1)
+        elif size > limit and size < n and depth < _BUCKET_MAX_DEPTH:
+            _bucket_core(bucket, None, depth + 1)
+        else:
+            _intro_core(bucket)
+        arr[pos:pos + size] = bucket
+        pos += size
+
+
+def bucket_sort(a, buckets=None, key=None, reverse=False, inplace=False):
     """
     Корзинная сортировка (Bucket Sort).
-    Использует Bubble Sort для сортировки внутри корзин.
+    Границы корзин выбираются по квантилям выборки из данных, внутри
+    корзин используются сортировка вставками (маленькие корзины) и
+    introsort (большие); переполненные корзины дробятся рекурсивно.
 
-    :param a: Список чисел.
-    :param buckets: Количество карманов (по умолчанию равно длине списка).
+    :param a: Список сравнимых элементов.
+    :param buckets: Количество карманов (по умолчанию n / 32, но не больше 1024).
     :param key: Функция-ключ.
     :param reverse: Флаг обратной сортировки.
-    :return: Новый отсортированный список.
+    :param inplace: Если True, сортирует сам список a вместо копии.
+    :return: Новый отсортированный список (или a при inplace=True).
+    :raises ValueError: Если buckets < 1.
     """
-    if not a:
-        return []
-    key_func = key if key else lambda x: x
-    values_for_range = [key_func(x) for x in a] if key else a
+    if buckets is not None and buckets < 1:
+        raise ValueError("Bucket count must be positive")
 
-    min_val = min(values_for_range)
-    max_val = max(values_for_range)
-    range_val = max_val - min_val
+    def core(arr):
+        _bucket_core(arr, buckets)
 
-    if buckets is None:
-        buckets = len(a)
+    return _sort_with_keys(core, a, key, reverse, inplace)
 
-    if range_val == 0:
-        result = a.copy()
-        if reverse:
-            result.reverse()
-        return result
 
-    buckets_list = [[] for _ in range(buckets)]
+def _sift_down_binary(arr, lo, pos, n):
+    """
+    Просеивание снизу вверх (Floyd) в двоичной max-куче arr[lo:lo + n].
+    Дыра спускается до листа по большему потомку (одно сравнение на
+    уровень), затем элемент поднимается на свое место.
+    """
+    x = arr[lo + pos]
+    start = pos
+    child = 2 * pos + 1
+    while child < n:
+        right = child + 1
+        if right < n and arr[lo + child] < arr[lo + right]:
+            child = right
+        arr[lo + pos] = arr[lo + child]
+        pos = child
+        child = 2 * pos + 1
+    while pos > start:
+        parent = (pos - 1) >> 1
+        if not arr[lo + parent] < x:
+            break
+        arr[lo + pos] = arr[lo + parent]
+        pos = parent
+    arr[lo + pos] = x
+
 
-    for num in a:
-        val = key_func(num)
-        normalized = (val - min_val) / range_val
-        idx = int(normalized * (buckets - 1))
-        buckets_list[idx].append(num)
+def _sift_down_dary(arr, lo, pos, n, d):
+    """Просеивание снизу вверх (Floyd) в d-арной max-куче arr[lo:lo + n]."""
+    x = arr[lo + pos]
+    start = pos
+    child = d * pos + 1
+    while child < n:
+        best = child
+        last = child + d
+        if last > n:
+            last = n
+        for c in range(child + 1, last):
+            if arr[lo + best] < arr[lo + c]:
+                best = c
+        arr[lo + pos] = arr[lo + best]
+        pos = best
+        child = d * pos + 1
+    while pos > start:
+        parent = (pos - 1) // d
+        if not arr[lo + parent] < x:
+            break
+        arr[lo + pos] = arr[lo + parent]
+        pos = parent
+    arr[lo + pos] = x
 
-    sorted_arr = []
-    for bucket in buckets_list:
-        if bucket:
-            sorted_arr.extend(bubble_sort(bucket, key=key, reverse=reverse))
 
-    if reverse:
-        sorted_arr.reverse()
-    return sorted_arr
+def _sift_down_min(arr, lo, pos, n):
+    """Просеивание снизу вверх (Floyd) в двоичной min-куче arr[lo:lo + n]."""
+    x = arr[lo + pos]
+    start = pos
+    child = 2 * pos + 1
+    while child < n:
+        right = child + 1
+        if right < n and arr[lo + right] < arr[lo + child]:
+            child = right
+        arr[lo + pos] = arr[lo + child]
+        pos = child
+        child = 2 * pos + 1
+    while pos > start:
+        parent = (pos - 1) >> 1
+        if not x < arr[lo + parent]:
+            break
+        arr[lo + pos] = arr[lo + parent]
+        pos = parent
+    arr[lo + pos] = x
+
+
+def _heap_core(arr, lo=0, hi=None, arity=2):
+    """
+    Пирамидальная сортировка среза arr[lo:hi] на месте по возрастанию.
+    Итеративная, с просеиванием снизу вверх; arity задает арность кучи.
+    """
+    if hi is None:
+        hi = len(arr)
+    n = hi - lo
 
+    if arity == 2:
+        # Построение кучи (max-heap)
+        for i in range(n // 2 - 1, -1, -1):
+            _sift_down_binary(arr, lo, i, n)
+        # Извлечение элементов из кучи
+        for end in range(n - 1, 0, -1):
+            arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+            _sift_down_binary(arr, lo, 0, end)
+    else:
+        for i in range((n - 2) // arity, -1, -1):
+            _sift_down_dary(arr, lo, i, n, arity)
+        for end in range(n - 1, 0, -1):
+            arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+            _sift_down_dary(arr, lo, 0, end, arity)
 
-def heap_sort(a, key=None, reverse=False):
+
+def heap_sort(a, key=None, reverse=False, arity=2, inplace=False):
     """
     Пирамидальная сортировка (Heap Sort).
+    Итеративная, с просеиванием снизу вверх (Floyd). Ключи вычисляются
+    заранее; arity > 2 включает d-арную кучу (меньше уровней, соседние
+    потомки лежат рядом в памяти).
 
     :param a: Список для сортировки.
     :param key: Функция-ключ.
     :param reverse: Флаг обратной сортировки.
-    :return: Новый отсортированный список.
-    """
-    key_func = key if key else lambda x: x
-
-    def heapify(arr, n, i):
-        largest = i
-        l = 2 * i + 1
-        r = 2 * i + 2
-
-        # Сравнение с учетом ключа и флага reverse
-        if l < n:
-            if (key_func(arr[l]) > key_func(arr[largest])) if not reverse else (
-                    key_func(arr[l]) < key_func(arr[largest])):
-                largest = l
-        if r < n:
-            if (key_func(arr[r]) > key_func(arr[largest])) if not reverse else (
-                    key_func(arr[r]) < key_func(arr[largest])):
-                largest = r
-        if largest != i:
-            arr[i], arr[largest] = arr[largest], arr[i]
-            heapify(arr, n, largest)
-
-    arr = a.copy()
-    n = len(arr)
+    :param arity: Арность кучи (по умолчанию 2).
+    :param inplace: Если True, сортирует сам список a вместо копии.
+    :return: Новый отсортированный список (или a при inplace=True).
+    :raises ValueError: Если arity < 2.
+    """
+    if arity < 2:
+        raise ValueError("Heap arity must be at least 2")
+
+    def core(arr):
+        _heap_core(arr, 0, len(arr), arity)
+
+    return _sort_with_keys(core, a, key, reverse, inplace)
 
-    # Построение кучи (max-heap)
-    for i in range(n // 2 - 1, -1, -1):
-        heapify(arr, n, i)
 
-    # Извлечение элементов из кучи
-    for i in range(n - 1, 0, -1):
-        arr[0], arr[i] = arr[i], arr[0]
-        heapify(arr, i, 0)
+def _select_core(arr, k, lo=0, hi=None):
+    """
+    Introselect: переставляет срез arr[lo:hi + 1] так, что arr[k] стоит
+    на своем месте, левее - не больше, правее - не меньше.
+    Разбиение то же, что в quick_sort; при вырождении срез сортируется кучей.
+    """
+    if hi is None:
+        hi = len(arr) - 1
+    depth = 2 * (hi - lo + 1).bit_length()
+    while hi - lo >= _INSERTION_THRESHOLD:
+        if depth == 0:
+            _heap_core(arr, lo, hi + 1)
+            return
+        depth -= 1
+        lt, gt = _partition3(arr, lo, hi)
+        if k < lt:
+            hi = lt - 1
+        elif k > gt:
+            lo = gt + 1
+        else:
+            return
+    _insertion_core(arr, lo, hi)
+
+
+def select_kth(a, k, key=None):
+    """
+    k-я порядковая статистика (Introselect), в среднем за O(n).
+
+    :param a: Список элементов.
+    :param k: Номер элемента в отсортированном порядке (с нуля).
+    :param key: Функция-ключ.
+    :return: Элемент, который стоял бы на позиции k после сортировки.
+    :raises IndexError: Если k вне диапазона [0, len(a)).
+    """
+    if not 0 <= k < len(a):
+        raise IndexError("select index out of range")
+
+    def core(arr):
+        _select_core(arr, k)
+
+    return _sort_with_keys(core, a, key)[k]
+
+
+def partial_sort(a, k, key=None, reverse=False):
+    """
+    Частичная сортировка за O(n + k log k): первые k элементов результата
+    совпадают с началом полностью отсортированного списка, порядок
+    остальных не определен.
+
+    :param a: Список для сортировки.
+    :param k: Сколько первых элементов упорядочить.
+    :param key: Функция-ключ.
+    :param reverse: Флаг обратной сортировки.
+    :return: Новый список.
+    """
+    n = len(a)
+    k = max(0, min(k, n))
+
+    def core(arr):
+        if k == 0:
+            return
+        # При reverse результат будет развернут, поэтому нужные элементы - в конце
+        if reverse:
+            _select_core(arr, n - k)
+            _intro_core(arr, n - k, n - 1)
+        else:
+            _select_core(arr, k - 1)
+            _intro_core(arr, 0, k - 1)
+
+    return _sort_with_keys(core, a, key, reverse)
+
+
+def top_k(a, k, key=None, reverse=False):
+    """
+    k первых элементов в порядке сортировки: то же, что
+    sorted(a, key=key, reverse=reverse)[:k], но за O(n log k) и с
+    памятью только под k результатов (ограниченная куча за один проход).
+
+    :param a: Итерируемый набор элементов.
+    :param k: Количество элементов.
+    :param key: Функция-ключ.
+    :param reverse: Если True, берутся k наибольших.
+    :return: Новый список (для буфера - буфер того же типа) из не более чем k элементов.
+    """
+    if k <= 0:
+        return _like(a, []) if isinstance(a, (array, memoryview, bytes, bytearray)) else []
+    # Индекс в записи разрешает равенство ключей в пользу более раннего элемента
+    if key is None:
+        entries = iter(a)
+    elif reverse:
+        entries = ((key(x), -i, x) for i, x in enumerate(a))
+    else:
+        entries = ((key(x), i, x) for i, x in enumerate(a))
+
+    heap = []
+    for entry in entries:
+        heap.append(entry)
+        if len(heap) == k:
+            break
+    size = len(heap)
+
+    if reverse:
+        # min-куча k наибольших: в корне худший из отобранных
+        for i in range(size // 2 - 1, -1, -1):
+            _sift_down_min(heap, 0, i, size)
+        for entry in entries:
+            if heap[0] < entry:
+                heap[0] = entry
+                _sift_down_min(heap, 0, 0, size)
+        for end in range(size - 1, 0, -1):
+            heap[0], heap[end] = heap[end], heap[0]
+            _sift_down_min(heap, 0, 0, end)
+    else:
+        for i in range(size // 2 - 1, -1, -1):
+            _sift_down_binary(heap, 0, i, size)
+        for entry in entries:
+            if entry < heap[0]:
+                heap[0] = entry
+                _sift_down_binary(heap, 0, 0, size)
+        for end in range(size - 1, 0, -1):
+            heap[0], heap[end] = heap[end], heap[0]
+            _sift_down_binary(heap, 0, 0, end)
+
+    if key is not None:
+        heap = [entry[2] for entry in heap]
+    if isinstance(a, (array, memoryview, bytes, bytearray)):
+        return _like(a, heap)
+    return heap
+
+
+def merge_runs(runs, reverse=False):
+    """
+    k-путевое слияние отсортированных последовательностей через кучу.
+    Генератор: в памяти держится только по одному элементу из каждой
+    серии. При равенстве первым идет элемент более ранней серии.
+
+    :param runs: Итерируемые, каждое отсортировано в нужном порядке.
+    :param reverse: True, если серии отсортированы по убыванию.
+    :return: Генератор элементов в общем порядке.
+    """
+    iterators = [iter(run) for run in runs]
+    sign = -1 if reverse else 1
+    heap = []
+    for idx, it in enumerate(iterators):
+        for value in it:
+            heap.append((value, sign * idx))
+            break
+    size = len(heap)
+    # Для убывающих серий нужна max-куча, иначе min-куча
+    sift = _sift_down_binary if reverse else _sift_down_min
+    for i in range(size // 2 - 1, -1, -1):
+        sift(heap, 0, i, size)
+
+    while size:
+        value, idx = heap[0]
+        yield value
+        for nxt in iterators[sign * idx]:
+            heap[0] = (nxt, idx)
+            break
+        else:
+            size -= 1
+            heap[0] = heap[size]
+            heap.pop()
+        if size:
+            sift(heap, 0, 0, size)
+
 
-    return arr
\ No newline at end of file
+# Полные сортировки пакета: имя -> функция (a, reverse=...)
+SORTS = {
+    "bubble": bubble_sort,
+    "quick": quick_sort,
+    "heap": heap_sort,
+    "merge": merge_sort,
+    "counting": counting_sort,
+    "radix": radix_sort,
+    "bucket": bucket_sort,
+}
@@ -0,0 +1,120 @@
+import mmap
+import os
+from array import array
+from contextlib import contextmanager
+
+# Размер блока чтения текста: числа одного блока - единственные
+# временные объекты int/float, весь результат хранится в array
+_BLOCK_BYTES = 1 << 20
+# Сколько чисел записывается одной строкой вывода
+_WRITE_BLOCK_ITEMS = 1 << 16
+
+
+def iter_text_blocks(f, block_bytes=_BLOCK_BYTES):
+    """
+    Потоково делит двоичный текстовый поток на блоки лексем-чисел,
+    читая его блоками block_bytes; число на границе блоков переносится
+    в следующий блок.
+
+    :param f: Файл, открытый в двоичном режиме.
+    :return: Генератор списков лексем (bytes).
+    """
+    tail = b""
+    while True:
+        block = f.read(block_bytes)
+        if not block:
+            break
+        tokens = (tail + block).split()
+        # Последнее число блока могло оборваться на середине
+        if block[-1:].isspace() or not tokens:
+            tail = b""
+        else:
+            tail = tokens.pop()
+        if tokens:
+            yield tokens
+    if tail:
+        yield [tail]
+
+
+def read_text(f, typecode=None, block_bytes=_BLOCK_BYTES):
+    """
+    Читает числа, разделенные пробельными символами, в компактный array.
+
+    Каждый блок разбирается сразу в array(typecode), поэтому память на
+    элемент - itemsize байт, а не объект числа плюс указатель списка.
+    Без typecode тип выбирается по данным: 'q', пока все числа целые
+    и помещаются в 64 бита, иначе 'd' (прочитанные целые переводятся в float).
+
+    :param f: Файл, открытый в двоичном режиме (например, sys.stdin.buffer).
+    :param typecode: 'q', 'd' или None (автоопределение).
+    :return: array с числами в порядке файла.
+    :raises ValueError: Если лексема не является числом нужного типа.
+    """
+    values = array(typecode or 'q')
+    for tokens in iter_text_blocks(f, block_bytes):
+        if values.typecode == 'q':
+            try:
+                values.extend(array('q', map(int, tokens)))
+                continue
+            except (ValueError, OverflowError):
+                if typecode == 'q':
+                    raise
+                values = array('d', values)
+        values.extend(array('d', map(float, tokens)))
+    return values
+
+
+def read_binary(f, typecode='q'):
+    """
+    Читает файл сырых элементов array(typecode) целиком в array.
+
+    :param f: Файл, открытый в двоичном режиме.
+    :raises ValueError: Если размер файла не кратен размеру элемента.
+    """
+    values = array(typecode)
+    while True:
+        # Размер блока кратен размеру элемента, короче только последний блок
+        block = f.read(_BLOCK_BYTES)
+        if not block:
+            return values
+        if len(block) % values.itemsize:
+            raise ValueError("Binary file size is not a multiple of the item size")
+        values.frombytes(block)
+
+
+@contextmanager
+def map_binary(path, typecode='q', writable=False):
+    """
+    Отображает файл сырых элементов array(typecode) в память (mmap)
+    и выдает memoryview этого формата. Данные подкачиваются с диска по
+    мере обращения. С writable изменения видны только в отображении
+    (ACCESS_COPY): файл не меняется, а представление можно сортировать
+    на месте.
+
+    :raises ValueError: Если размер файла не кратен размеру элемента.
+    """
+    itemsize = array(typecode).itemsize
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size % itemsize:
+            raise ValueError("Binary file size is not a multiple of the item size")
+        if size == 0:
+            # Пустой файл нельзя отобразить
+            yield memoryview(array(typecode))
+            return
+        access = mmap.ACCESS_COPY if writable else mmap.ACCESS_READ
+        mapped = mmap.mmap(f.fileno(), 0, access=access)
+    view = memoryview(mapped).cast(typecode)
+    try:
+        yield view
+    finally:
+        view.release()
+        mapped.close()
+
+
+def write_text(f, values, block_items=_WRITE_BLOCK_ITEMS):
+    """Записывает числа по одному в строке блоками (f - двоичный поток)."""
+    for start in range(0, len(values), block_items):
+        block = values[start:start + block_items]
+        f.write("\n".join(map(str, block)).encode())
+        f.write(b"\n")
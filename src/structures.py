@@ -1,8 +1,16 @@
+from itertools import chain, islice
+
+# Начальная емкость кольцевого буфера очереди (степень двойки)
+_QUEUE_MIN_CAPACITY = 8
+
+
 class Node:
     """
     Узел односвязного списка.
     Хранит значение, ссылку на следующий элемент и минимум в стеке.
     """
+    __slots__ = ("value", "next", "min")
+
     def __init__(self, value, next_node=None):
         self.value = value
         self.next = next_node
@@ -13,8 +21,227 @@ class Node:
 
 class Stack:
     """
-    Стек на основе связного списка.
+    Стек на основе двух растущих списков: значения и минимумы префиксов.
+    Элемент стоит два указателя (около 16 байт) вместо объекта Node.
+    """
+    __slots__ = ("_values", "_mins")
+
+    def __init__(self, iterable=()):
+        """:param iterable: Начальные элементы (последний окажется на вершине)."""
+        self._values = []
+        # _mins[i] - минимум _values[0..i], поэтому min() за O(1)
+        self._mins = []
+        self.push_many(iterable)
+
+    def push(self, x):
+        """Добавляет элемент на вершину стека."""
+        self._mins.append(min(x, self._mins[-1]) if self._mins else x)
+        self._values.append(x)
+
+    def push_many(self, values):
+        """
+        Добавляет элементы по порядку, как push для каждого, но минимумы
+        префиксов считаются одним проходом, а значения добавляются
+        одним extend.
+        """
+        values = list(values)
+        if not values:
+            return
+        current = self._mins[-1] if self._mins else values[0]
+        mins = []
+        append = mins.append
+        for x in values:
+            # То же, что min(x, current) в push
+            if not current < x:
+                current = x
+            append(current)
+        self._values.extend(values)
+        self._mins.extend(mins)
+
+    extend = push_many
+
+    def pop_many(self, k):
+        """
+        Удаляет k элементов с вершины одним срезом.
+
+        :return: Список удаленных элементов в порядке pop (вершина первой).
+        :raises ValueError: Если k < 0.
+        :raises IndexError: Если в стеке меньше k элементов (стек не меняется).
+        """
+        if k < 0:
+            raise ValueError("Number of items cannot be negative")
+        if k > len(self._values):
+            raise IndexError("pop more items than the stack holds")
+        if not k:
+            return []
+        result = self._values[:-k - 1:-1]
+        del self._values[-k:]
+        del self._mins[-k:]
+        return result
+
+    def pop(self):
+        """
+        Удаляет и возвращает элемент с вершины стека.
+        :raises IndexError: Если стек пуст.
+        """
+        if not self._values:
+            raise IndexError("pop from empty stack")
+        self._mins.pop()
+        return self._values.pop()
+
+    def peek(self):
+        """Возвращает верхний элемент без удаления."""
+        if not self._values:
+            raise IndexError("peek from empty stack")
+        return self._values[-1]
+
+    def is_empty(self):
+        """Возвращает True, если стек пуст."""
+        return not self._values
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        """Обход без удаления, от вершины ко дну (в порядке pop)."""
+        return reversed(self._values)
+
+    def min(self):
+        """
+        :raises IndexError: Если стек пуст.
+        """
+        if not self._mins:
+            raise IndexError("min from empty stack")
+        return self._mins[-1]
+
+class Queue:
+    """
+    Очередь на основе кольцевого буфера: список емкостью в степень двойки,
+    индекс начала и размер. Буфер удваивается при заполнении и сжимается
+    вдвое, когда занято меньше четверти; элемент стоит 8-16 байт.
+    """
+    __slots__ = ("_items", "_head", "_size")
+
+    def __init__(self, iterable=()):
+        """:param iterable: Начальные элементы (первый окажется в начале очереди)."""
+        self._items = [None] * _QUEUE_MIN_CAPACITY
+        self._head = 0
+        self._size = 0
+        self.enqueue_many(iterable)
+
+    def _resize(self, capacity):
+        """Переносит элементы в новый буфер, начиная с индекса 0."""
+        items = self._items
+        end = self._head + self._size
+        ordered = items[self._head:end] + items[:max(0, end - len(items))]
+        self._items = ordered + [None] * (capacity - self._size)
+        self._head = 0
+
+    def _shrink(self):
+        """Сжимает буфер вдвое, пока занято меньше четверти."""
+        capacity = len(self._items)
+        while capacity > _QUEUE_MIN_CAPACITY and 4 * self._size < capacity:
+            capacity //= 2
+        if capacity != len(self._items):
+            self._resize(capacity)
+
+    def enqueue(self, x):
+        """Добавляет элемент в конец очереди."""
+        if self._size == len(self._items):
+            self._resize(2 * len(self._items))
+        self._items[(self._head + self._size) & (len(self._items) - 1)] = x
+        self._size += 1
+
+    def dequeue(self):
+        """
+        Удаляет и возвращает элемент из начала очереди.
+        :raises IndexError: Если очередь пуста.
+        """
+        if not self._size:
+            raise IndexError("dequeue from empty queue")
+        value = self._items[self._head]
+        # Буфер не должен удерживать выданный элемент
+        self._items[self._head] = None
+        self._head = (self._head + 1) & (len(self._items) - 1)
+        self._size -= 1
+        self._shrink()
+        return value
+
+    def enqueue_many(self, values):
+        """
+        Добавляет элементы в конец по порядку: буфер расширяется один раз,
+        значения копируются не более чем двумя срезами.
+        """
+        values = list(values)
+        count = len(values)
+        if not count:
+            return
+        needed = self._size + count
+        if needed > len(self._items):
+            capacity = len(self._items)
+            while capacity < needed:
+                capacity *= 2
+            self._resize(capacity)
+        items = self._items
+        start = (self._head + self._size) & (len(items) - 1)
+        # Часть до конца буфера и часть, перенесенная в его начало
+        first = min(count, len(items) - start)
+        items[start:start + first] = values[:first]
+        items[:count - first] = values[first:]
+        self._size = needed
+
+    def dequeue_many(self, k):
+        """
+        Удаляет k элементов из начала не более чем двумя срезами.
+
+        :return: Список удаленных элементов в порядке очереди.
+        :raises ValueError: Если k < 0.
+        :raises IndexError: Если в очереди меньше k элементов (очередь не меняется).
+        """
+        if k < 0:
+            raise ValueError("Number of items cannot be negative")
+        if k > self._size:
+            raise IndexError("dequeue more items than the queue holds")
+        items = self._items
+        head = self._head
+        first = min(k, len(items) - head)
+        result = items[head:head + first]
+        items[head:head + first] = [None] * first
+        rest = k - first
+        if rest:
+            result += items[:rest]
+            items[:rest] = [None] * rest
+        self._head = (head + k) & (len(items) - 1)
+        self._size -= k
+        self._shrink()
+        return result
+
+    def front(self):
+        """Возвращает первый элемент очереди без удаления."""
+        if not self._size:
+            raise IndexError("front from empty queue")
+        return self._items[self._head]
+
+    def is_empty(self):
+        return not self._size
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        """Обход без удаления, от начала очереди к концу."""
+        items = self._items
+        end = self._head + self._size
+        return chain(islice(items, self._head, min(end, len(items))),
+                     islice(items, 0, max(0, end - len(items))))
+
+class LinkedStack:
+    """
+    Стек на основе связного списка узлов Node (объект на каждый элемент).
+    Тот же интерфейс, что у Stack; оставлен для сравнения в бенчмарках.
     """
+    __slots__ = ("_top", "_size")
+
     def __init__(self):
         self._top = None
         self._size = 0
@@ -57,10 +284,13 @@ class Stack:
             raise IndexError("min from empty stack")
         return self._top.min
 
-class Queue:
+class LinkedQueue:
     """
-    Очередь на основе связного списка.
+    Очередь на основе связного списка узлов Node (объект на каждый элемент).
+    Тот же интерфейс, что у Queue; оставлена для сравнения в бенчмарках.
     """
+    __slots__ = ("_front", "_rear", "_size")
+
     def __init__(self):
         self._front = None
         self._rear = None
@@ -100,4 +330,4 @@ class Queue:
         return self._front is None
 
     def __len__(self):
-        return self._size
\ No newline at end of file
+        return self._size
@@ -1,10 +1,40 @@
 import unittest
+import contextlib
+import io
+import math
+import json
+import os
 import random
-from src.math_utils import factorial, factorial_recursive, fibo, fibo_recursive
-from src.structures import Stack, Queue
+import sys
+import tempfile
+import time
+from array import array
+from src.math_utils import (
+    factorial, factorial_recursive, factorial_fast, factorial_mod, log_factorial, factorial_approx,
+    fibo, fibo_recursive, fibo_fast, fibo_mod, fibo_range
+)
+from src.math_cache import MathCache
+from src.structures import Stack, Queue, LinkedStack, LinkedQueue, Node
+from src.generators import GENERATORS, many_duplicates
+from src.parallel import parallel_sort
+from src.external import external_sort
+from src.streaming import map_binary, read_binary, read_text, write_text
+from src.isolation import BenchCase, run_isolated
+from src import cli
+from src import main as main_module
+from src.instrument import count_operations, trace_memory
+from src import backends, sorts
+from src.results_store import save_results, load_results, compare, welch_t_test
+from src.results_store import main as results_store_main
+from src.benchmark import (
+    BenchResult, benchmark_sorts, benchmark_memory, benchmark_backends, benchmark_generators,
+    benchmark_math, benchmark_structure_memory,
+    measure, fit_complexity, geometric_sizes, scaling_suite
+)
 from src.sorts import (
     bubble_sort, quick_sort, counting_sort,
-    radix_sort, bucket_sort, heap_sort
+    radix_sort, bucket_sort, heap_sort, merge_sort,
+    select_kth, partial_sort, top_k, merge_runs
 )
 
 
@@ -25,6 +55,34 @@ class TestMathAlgos(unittest.TestCase):
         self.assertEqual(factorial_recursive(5), 120)
         with self.assertRaises(ValueError):
             factorial_recursive(-5)
+        # Глубина рекурсии - log2(n), а не n
+        self.assertEqual(factorial_recursive(5000), factorial(5000))
+
+    def test_factorial_fast(self):
+        for n in list(range(100)) + [1000, 4321]:
+            self.assertEqual(factorial_fast(n), factorial(n))
+            self.assertEqual(factorial_fast(n, method="swing"), factorial(n))
+        with self.assertRaises(ValueError):
+            factorial_fast(-1)
+        with self.assertRaises(ValueError):
+            factorial_fast(5, method="gamma")
+
+    def test_factorial_mod(self):
+        for p in (1, 2, 7, 97, 10 ** 9 + 7):
+            for n in (0, 1, 6, 50):
+                self.assertEqual(factorial_mod(n, p), factorial(n) % p)
+        with self.assertRaises(ValueError):
+            factorial_mod(3, 0)
+
+    def test_log_factorial(self):
+        self.assertAlmostEqual(log_factorial(10), math.log(3628800))
+        self.assertAlmostEqual(log_factorial(100, 10), math.log10(factorial(100)))
+        mantissa, exponent = factorial_approx(10)
+        self.assertEqual(exponent, 6)
+        self.assertAlmostEqual(mantissa, 3.6288)
+        self.assertEqual(factorial_approx(1000)[1], len(str(factorial(1000))) - 1)
+        with self.assertRaises(ValueError):
+            log_factorial(-1)
 
     def test_fibo(self):
         # Последовательность: 0, 1, 1, 2, 3, 5, 8, 13, 21, 34, 55
@@ -40,6 +98,51 @@ class TestMathAlgos(unittest.TestCase):
         self.assertEqual(fibo_recursive(6), 8)  # 0,1,1,2,3,5,8
         with self.assertRaises(ValueError):
             fibo_recursive(-1)
+        self.assertEqual(fibo_recursive(80, memo=True), fibo(80))
+
+    def test_fibo_fast(self):
+        for n in range(200):
+            self.assertEqual(fibo_fast(n), fibo(n))
+        self.assertEqual(fibo_fast(1000) % 10 ** 9, fibo(1000) % 10 ** 9)
+        with self.assertRaises(ValueError):
+            fibo_fast(-1)
+
+    def test_fibo_mod(self):
+        for m in (1, 2, 10, 10 ** 9 + 7):
+            for n in (0, 1, 2, 50, 333):
+                self.assertEqual(fibo_mod(n, m), fibo(n) % m)
+        # Период Пизано по модулю 10 равен 60
+        self.assertEqual(fibo_mod(10 ** 18, 10), fibo(10 ** 18 % 60) % 10)
+        with self.assertRaises(ValueError):
+            fibo_mod(5, 0)
+
+    def test_fibo_range(self):
+        self.assertEqual(fibo_range(0, 8), [0, 1, 1, 2, 3, 5, 8, 13])
+        self.assertEqual(fibo_range(100, 103), [fibo(100), fibo(101), fibo(102)])
+        self.assertEqual(fibo_range(5, 5), [])
+        with self.assertRaises(ValueError):
+            fibo_range(-1, 3)
+
+    def test_math_cache(self):
+        cache = MathCache(maxsize=3, table_size=200, table_step=16)
+        for n in (5, 150, 151, 40, 5):
+            self.assertEqual(cache.factorial(n), factorial(n))
+        # Повторный вызов 5 - промах: запись вытеснена, в LRU три записи
+        self.assertEqual(cache.cache_info(), {"hits": 0, "misses": 5, "size": 3, "maxsize": 3})
+        self.assertEqual(cache.factorial(5), 120)
+        self.assertEqual(cache.hits, 1)
+        for n in list(range(80)) + list(range(80, 0, -1)) + [1000, 3]:
+            self.assertEqual(cache.fibo(n), fibo(n))
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+        unbounded = MathCache(maxsize=None, table_size=0)
+        for n in range(300):
+            self.assertEqual(unbounded.factorial(n), factorial(n))
+        self.assertEqual(len(unbounded), 300)
+        with self.assertRaises(ValueError):
+            cache.fibo(-1)
+        with self.assertRaises(ValueError):
+            MathCache(maxsize=-1)
 
 
 class TestStructures(unittest.TestCase):
@@ -107,6 +210,80 @@ class TestStructures(unittest.TestCase):
         with self.assertRaises(IndexError):
             q.front()
 
+    def test_queue_ring_buffer(self):
+        # Чередование добавлений и удалений проводит начало по кругу буфера,
+        # рост и сжатие должны сохранять порядок
+        q = Queue()
+        expected = []
+        for step in range(2000):
+            if step % 3 == 2 or step > 1500:
+                if expected:
+                    self.assertEqual(q.dequeue(), expected.pop(0))
+            else:
+                q.enqueue(step)
+                expected.append(step)
+            self.assertEqual(len(q), len(expected))
+        self.assertEqual(q.is_empty(), not expected)
+
+    def test_stack_bulk(self):
+        s = Stack([10, 5, 20])
+        self.assertEqual((len(s), s.peek(), s.min()), (3, 20, 5))
+        s.push_many(x for x in (7, 2, 9))
+        s.extend([])
+        self.assertEqual(list(s), [9, 2, 7, 20, 5, 10])  # от вершины, стек не меняется
+        self.assertEqual(s.min(), 2)
+        self.assertEqual(s.pop_many(2), [9, 2])
+        self.assertEqual(s.min(), 5)
+        self.assertEqual(s.pop_many(0), [])
+        with self.assertRaises(IndexError):
+            s.pop_many(5)
+        self.assertEqual(len(s), 4)
+        with self.assertRaises(ValueError):
+            s.pop_many(-1)
+        self.assertEqual(s.pop_many(4), [7, 20, 5, 10])
+        self.assertTrue(s.is_empty())
+
+    def test_queue_bulk(self):
+        q = Queue(range(5))
+        self.assertEqual(q.dequeue_many(3), [0, 1, 2])
+        # Добавление переносится через конец буфера в его начало
+        q.enqueue_many(range(5, 12))
+        self.assertEqual(list(q), list(range(3, 12)))
+        self.assertEqual(len(q), 9)
+        with self.assertRaises(IndexError):
+            q.dequeue_many(10)
+        with self.assertRaises(ValueError):
+            q.dequeue_many(-1)
+        self.assertEqual(q.dequeue_many(8), list(range(3, 11)))
+        self.assertEqual((q.front(), len(q)), (11, 1))
+        q.enqueue_many(iter(range(100)))
+        self.assertEqual(q.dequeue_many(101), [11] + list(range(100)))
+        self.assertTrue(q.is_empty())
+        self.assertEqual(list(q), [])
+
+    def test_linked_structures(self):
+        # Прежние реализации на узлах ведут себя так же
+        s, linked_s = Stack(), LinkedStack()
+        q, linked_q = Queue(), LinkedQueue()
+        for x in (7, 3, 9, 3, 1, 8):
+            s.push(x)
+            linked_s.push(x)
+            q.enqueue(x)
+            linked_q.enqueue(x)
+        while not s.is_empty():
+            self.assertEqual((s.min(), s.peek()), (linked_s.min(), linked_s.peek()))
+            self.assertEqual(s.pop(), linked_s.pop())
+            self.assertEqual(q.dequeue(), linked_q.dequeue())
+        self.assertTrue(linked_s.is_empty() and linked_q.is_empty())
+        with self.assertRaises(AttributeError):
+            Node(1).extra = 2
+
+    def test_structure_memory(self):
+        results = benchmark_structure_memory(
+            {"Stack": (Stack, "push"), "LinkedStack": (LinkedStack, "push")}, 5000)
+        self.assertEqual([r.dataset for r in results], ["push", "push"])
+        self.assertLess(results[0].bytes_per_element, results[1].bytes_per_element)
+
 
 class TestSorts(unittest.TestCase):
     """Тестирование алгоритмов сортировки"""
@@ -140,22 +317,117 @@ class TestSorts(unittest.TestCase):
         arr = [-10, 5, -2, 8]
         self._check_sort(quick_sort, arr, key=abs)
 
+    def test_quick_sort_degenerate_inputs(self):
+        # Lomuto-разбиение здесь деградировало до O(n^2) и RecursionError
+        sorted_with_dups = list(range(3000)) + [7] * 3000
+        self._check_sort(quick_sort, sorted_with_dups)
+        self._check_sort(quick_sort, [1] * 5000)
+        self._check_sort(quick_sort, self.reverse_arr * 100, reverse=True)
+
     def test_heap_sort(self):
         self._check_sort(heap_sort, self.random_arr)
         self._check_sort(heap_sort, self.reverse_arr)
 
+    def test_heap_sort_arity(self):
+        for arity in (3, 4, 8):
+            self.assertEqual(heap_sort(self.random_arr, arity=arity), sorted(self.random_arr))
+            self.assertEqual(heap_sort(self.random_arr, key=abs, reverse=True, arity=arity),
+                             sorted(self.random_arr, key=abs, reverse=True))
+        with self.assertRaises(ValueError):
+            heap_sort(self.random_arr, arity=1)
+
+    def test_merge_sort(self):
+        self._check_sort(merge_sort, self.random_arr)
+        self._check_sort(merge_sort, self.empty_arr)
+        self._check_sort(merge_sort, self.sorted_arr)
+        self._check_sort(merge_sort, self.reverse_arr)
+        self._check_sort(merge_sort, self.random_arr, key=abs, reverse=True)
+        # Серии разной направленности и длины, чтобы задеть слияние с галопом
+        runs = list(range(500)) + list(range(300, 0, -1)) + list(range(100, 900, 3))
+        self._check_sort(merge_sort, runs)
+        self._check_sort(merge_sort, self.float_arr * 10)
+
+    def test_select_kth(self):
+        expected = sorted(self.random_arr)
+        for k in (0, 10, len(expected) - 1):
+            self.assertEqual(select_kth(self.random_arr, k), expected[k])
+        self.assertEqual(select_kth([-10, 5, -2, 8], 0, key=abs), -2)
+        with self.assertRaises(IndexError):
+            select_kth(self.random_arr, len(self.random_arr))
+
+    def test_partial_sort(self):
+        for reverse in (False, True):
+            expected = sorted(self.random_arr, reverse=reverse)
+            result = partial_sort(self.random_arr, 10, reverse=reverse)
+            self.assertEqual(result[:10], expected[:10])
+            self.assertEqual(sorted(result), sorted(self.random_arr))
+
+    def test_top_k(self):
+        arr = [3, -1, 2, 1, -3, -2, 1, 3]
+        for reverse in (False, True):
+            for key in (None, abs):
+                expected = sorted(arr, key=key, reverse=reverse)
+                for k in (0, 1, 3, len(arr), len(arr) + 5):
+                    self.assertEqual(top_k(arr, k, key=key, reverse=reverse), expected[:k])
+        # Принимает любой итерируемый объект
+        self.assertEqual(top_k(iter(self.random_arr), 5), sorted(self.random_arr)[:5])
+
+    def test_merge_runs(self):
+        runs = [[1, 4, 9], [], [2, 2, 10], [0]]
+        self.assertEqual(list(merge_runs(runs)), [0, 1, 2, 2, 4, 9, 10])
+        desc = [run[::-1] for run in runs]
+        self.assertEqual(list(merge_runs(desc, reverse=True)), [10, 9, 4, 2, 2, 1, 0])
+
     def test_counting_sort(self):
         self._check_sort(counting_sort, self.random_arr)  # С отрицательными
         self._check_sort(counting_sort, self.duplicates_arr)
 
+    def test_counting_sort_sparse_range(self):
+        # Диапазон 10^9 не должен приводить к таблице на миллиард счетчиков
+        self.assertEqual(counting_sort([10 ** 9, 0, -10 ** 9, 0]), [-10 ** 9, 0, 0, 10 ** 9])
+        self._check_sort(counting_sort, [x * 10 ** 6 for x in self.random_arr], reverse=True)
+        # Разреженные ключи за пределами int64 сортируются точно (при любом бэкенде)
+        huge = [2 ** 63 + i * 10 ** 7 for i in range(1500)] + list(range(1500))
+        self._check_sort(counting_sort, huge)
+
+    def test_counting_sort_key(self):
+        records = [("b", 3), ("a", 1), ("c", 3), ("d", -2), ("e", 1)]
+        for reverse in (False, True):
+            self._check_sort(counting_sort, records, key=lambda r: r[1], reverse=reverse)
+            sparse = [(name, value * 10 ** 8) for name, value in records]
+            self._check_sort(counting_sort, sparse, key=lambda r: r[1], reverse=reverse)
+
     def test_radix_sort(self):
-        # Radix работает только с неотрицательными числами
         pos_arr = [abs(x) for x in self.random_arr]
         self._check_sort(radix_sort, pos_arr)
+        # Отрицательные числа сдвигаются на минимум
+        self._check_sort(radix_sort, self.random_arr)
+        self._check_sort(radix_sort, self.random_arr, reverse=True)
+        self._check_sort(radix_sort, self.duplicates_arr)
+        # Числа за пределами 64 бит
+        self._check_sort(radix_sort, [2 ** 70, -2 ** 65, 3, 0])
+
+    def test_radix_sort_floats(self):
+        arr = self.float_arr + [-1.5, 0.0, -0.25, 1e300, -1e-300, float("inf"), float("-inf")]
+        self._check_sort(radix_sort, arr)
+        self._check_sort(radix_sort, arr, reverse=True)
 
-        # Проверка на выброс исключения при отрицательных
+    def test_radix_sort_digit_width(self):
+        self.assertEqual(radix_sort(self.random_arr, bits=16), sorted(self.random_arr))
+        self.assertEqual(radix_sort(self.random_arr, bits=4), sorted(self.random_arr))
         with self.assertRaises(ValueError):
-            radix_sort([-1, 5, 2])
+            radix_sort([1, 2], bits=0)
+        with self.assertRaises(ValueError):
+            radix_sort([1, 2], bits=32)
+
+    def test_radix_sort_deprecated_base(self):
+        for base in (2, 10, 256, 10 ** 6):
+            with self.assertWarns(DeprecationWarning):
+                self.assertEqual(radix_sort(self.random_arr, base=base), sorted(self.random_arr))
+        with self.assertWarns(DeprecationWarning), self.assertRaises(ValueError):
+            radix_sort([1, 2], base=1)
+        with self.assertRaises(TypeError):
+            radix_sort([1, 2], bits=8, base=10)
 
     def test_bucket_sort(self):
         # Bucket sort хорошо работает с float
@@ -163,6 +435,623 @@ class TestSorts(unittest.TestCase):
         # И с int тоже должен работать
         self._check_sort(bucket_sort, [1, 10, 5, 3])
 
+    def test_bucket_sort_reverse(self):
+        self._check_sort(bucket_sort, self.float_arr, reverse=True)
+        self.assertEqual(bucket_sort([1, 2, 5, 6, 3], buckets=2, reverse=True), [6, 5, 3, 2, 1])
+
+    def test_bucket_sort_skewed(self):
+        # Плотный кластер и несколько выбросов: раньше почти все попадало в одну корзину
+        skewed = [1.0 + x * 1e-9 for x in self.random_arr * 20] + [1e9, -1e9, 5e8]
+        self._check_sort(bucket_sort, skewed)
+        self._check_sort(bucket_sort, [7] * 500 + self.random_arr)
+        self.assertEqual(bucket_sort(self.random_arr, buckets=1), sorted(self.random_arr))
+        with self.assertRaises(ValueError):
+            bucket_sort(self.random_arr, buckets=0)
+
+    def test_bucket_sort_numeric(self):
+        # Числа раскладываются арифметически; бесконечность, числа за пределами
+        # float и перекос уходят на корзины по выборке
+        uniform = [random.uniform(-5, 5) for _ in range(2000)]
+        self._check_sort(bucket_sort, uniform)
+        self._check_sort(bucket_sort, uniform + [3, -2, 0])
+        self._check_sort(bucket_sort, [random.randint(-2 ** 80, 2 ** 80) for _ in range(500)])
+        self._check_sort(bucket_sort, uniform[:300] + [float("inf"), float("-inf")])
+        self._check_sort(bucket_sort, [10 ** 400] + self.random_arr * 10 + [0.5])
+        self._check_sort(bucket_sort, [random.expovariate(1) ** 8 for _ in range(2000)])
+        self.assertEqual(bucket_sort(array('d', uniform), inplace=True), array('d', sorted(uniform)))
+
+    def test_bucket_sort_keeps_random_stream(self):
+        # Выборка берется из собственного генератора, засеянный random не сдвигается
+        random.seed(1)
+        expected = [random.random() for _ in range(3)]
+        random.seed(1)
+        bucket_sort(self.float_arr * 10)
+        self.assertEqual([random.random() for _ in range(3)], expected)
+
+    def test_parallel_sort(self):
+        big = self.random_arr * 40
+        floats = self.float_arr * 40
+        strings = [str(x) for x in big]
+        # threshold=0 включает параллельный путь даже на маленьком входе
+        self.assertEqual(parallel_sort(big, workers=2, threshold=0), sorted(big))
+        self.assertEqual(parallel_sort(floats, workers=3, threshold=0, reverse=True),
+                         sorted(floats, reverse=True))
+        self.assertEqual(parallel_sort(big, workers=2, threshold=0, key=abs, reverse=True),
+                         sorted(big, key=abs, reverse=True))
+        # Нечисловые данные сортируются в текущем процессе
+        self.assertEqual(parallel_sort(strings, workers=2, threshold=0), sorted(strings))
+        self.assertEqual(parallel_sort([], workers=2, threshold=0), [])
+        # Выборка разделителей не сдвигает засеянный поток random
+        random.seed(1)
+        expected = [random.random() for _ in range(3)]
+        random.seed(1)
+        parallel_sort(big, workers=2, threshold=0)
+        self.assertEqual([random.random() for _ in range(3)], expected)
+
+    def test_key_called_once_per_element(self):
+        for sort_func in (bubble_sort, quick_sort, heap_sort, bucket_sort):
+            calls = []
+
+            def key(x):
+                calls.append(x)
+                return abs(x)
+
+            sort_func(self.random_arr, key=key)
+            self.assertEqual(len(calls), len(self.random_arr), sort_func.__name__)
+
+    def test_key_sort_is_stable(self):
+        # Равные по модулю числа должны сохранять исходный порядок
+        arr = [3, -1, 2, 1, -3, -2, 1, 3]
+        for sort_func in (bubble_sort, quick_sort, heap_sort, bucket_sort):
+            self._check_sort(sort_func, arr, key=abs)
+            self._check_sort(sort_func, arr, key=abs, reverse=True)
+
+    def test_typed_arrays(self):
+        ints = array('q', self.random_arr)
+        floats = array('d', (x / 7 for x in self.random_arr))
+        for sort_func in (bubble_sort, quick_sort, heap_sort, merge_sort, bucket_sort,
+                          counting_sort, radix_sort):
+            for data in (ints, floats):
+                if sort_func is counting_sort and data is floats:
+                    continue
+                result = sort_func(data, reverse=True)
+                self.assertIsInstance(result, array, sort_func.__name__)
+                self.assertEqual(result.typecode, data.typecode)
+                self.assertEqual(result.tolist(), sorted(data, reverse=True), sort_func.__name__)
+        self.assertEqual(merge_sort(ints, key=abs).tolist(), sorted(ints, key=abs))
+
+    def test_buffer_protocol(self):
+        data = bytearray(random.randrange(256) for _ in range(300))
+        view = memoryview(array('q', self.random_arr))
+        for sort_func in (quick_sort, heap_sort, merge_sort, bucket_sort, counting_sort, radix_sort):
+            for buf in (data, bytes(data), view):
+                result = sort_func(buf, reverse=True)
+                self.assertIs(type(result), type(buf), sort_func.__name__)
+                self.assertEqual(list(result), sorted(buf, reverse=True), sort_func.__name__)
+            # На месте: сам bytearray и память под memoryview
+            buf = bytearray(data)
+            self.assertIs(sort_func(buf, inplace=True), buf)
+            self.assertEqual(list(buf), sorted(data))
+            backing = array('q', self.random_arr)
+            sort_func(memoryview(backing), inplace=True)
+            self.assertEqual(backing.tolist(), sorted(self.random_arr), sort_func.__name__)
+        self.assertIsInstance(top_k(view, 3), memoryview)
+        with self.assertRaises(ValueError):
+            quick_sort(memoryview(b"abc").cast('c'))
+
+    def test_inplace(self):
+        for sort_func in (bubble_sort, quick_sort, heap_sort, merge_sort, bucket_sort,
+                          counting_sort, radix_sort):
+            for options in ({}, {"reverse": True}):
+                arr = self.random_arr.copy()
+                result = sort_func(arr, inplace=True, **options)
+                self.assertIs(result, arr, sort_func.__name__)
+                self.assertEqual(arr, sorted(self.random_arr, **options), sort_func.__name__)
+        arr = [3, -1, 2, 1, -3]
+        self.assertIs(quick_sort(arr, key=abs, inplace=True), arr)
+        self.assertEqual(arr, [-1, 1, 2, 3, -3])
+        empty = []
+        self.assertIs(counting_sort(empty, inplace=True), empty)
+
+
+class TestBenchmark(unittest.TestCase):
+    """Тестирование системы замеров"""
+
+    def test_measure(self):
+        samples, loops = measure(bubble_sort, list(range(10)), repeat=4, min_time=0.001)
+        self.assertEqual(len(samples), 4)
+        self.assertGreaterEqual(loops, 1)
+        self.assertTrue(all(t > 0 for t in samples))
+
+    def test_bench_result_statistics(self):
+        r = BenchResult("data", "algo", 10, [3.0, 1.0, 2.0, 4.0, 5.0], loops=1)
+        self.assertTrue(r.ok)
+        self.assertEqual(r.min, 1.0)
+        self.assertEqual(r.median, 3.0)
+        self.assertAlmostEqual(r.p95, 4.8)
+        self.assertAlmostEqual(r.mean, 3.0)
+        lo, hi = r.ci95
+        self.assertLess(lo, r.mean)
+        self.assertGreater(hi, r.mean)
+
+    def test_benchmark_typed_buffers(self):
+        # Буферы копируются перед каждым вызовом, как и списки
+        source = array('q', [3, 1, 2])
+        arrays = {"array": source, "bytearray": bytearray(b"\x03\x01\x02"),
+                  "memoryview": memoryview(array('d', [3.0, 1.0, 2.0]))}
+
+        def sort_inplace(a):
+            return quick_sort(a, inplace=True)
+
+        results = benchmark_sorts(arrays, {"Quick": quick_sort, "Quick in-place": sort_inplace},
+                                  repeat=2, min_time=0.0001)
+        self.assertTrue(all(r.ok for r in results), [r.error for r in results])
+        self.assertEqual(source, array('q', [3, 1, 2]))
+        self.assertTrue(all(r.ok for r in benchmark_memory(arrays, {"Quick": quick_sort}, inplace=True)))
+
+    def test_benchmark_sorts_errors(self):
+        def broken(arr):
+            raise RuntimeError("boom")
+
+        results = benchmark_sorts({"small": [3, 1, 2]}, {"Quick": quick_sort, "Broken": broken},
+                                  repeat=2, min_time=0.0001)
+        self.assertEqual([r.algorithm for r in results], ["Quick", "Broken"])
+        self.assertTrue(results[0].ok)
+        self.assertFalse(results[1].ok)
+        self.assertIn("boom", results[1].error)
+
+    def test_geometric_sizes(self):
+        self.assertEqual(geometric_sizes(10, 1000, 10), [10, 100, 1000])
+        with self.assertRaises(ValueError):
+            geometric_sizes(10, 1000, 1)
+
+    def test_fit_complexity(self):
+        sizes = [100, 1000, 10000, 100000]
+        self.assertEqual(fit_complexity(sizes, [n * 1e-7 for n in sizes])["best"], "O(n)")
+        self.assertEqual(fit_complexity(sizes, [n * n * 1e-9 for n in sizes])["best"], "O(n^2)")
+        fit = fit_complexity(sizes, [n * (n.bit_length()) * 1e-8 for n in sizes])
+        self.assertEqual(fit["best"], "O(n log n)")
+        self.assertIsNone(fit_complexity([100], [1.0]))
+
+    def test_scaling_suite_budget(self):
+        def slow(arr):
+            if len(arr) > 32:
+                raise RuntimeError("too slow")
+            return quick_sort(arr)
+
+        curves = scaling_suite({"slow": slow, "quick": quick_sort},
+                               {"rev": lambda n, seed=None: list(range(n, 0, -1))},
+                               [16, 32, 64, 128], time_budget=0.05, repeat=2, min_time=0.0001)
+        by_name = {c.algorithm: c for c in curves}
+        self.assertEqual(by_name["slow"].sizes, [16, 32])
+        self.assertEqual(by_name["slow"].stopped_at, 64)
+        self.assertEqual(by_name["quick"].sizes, [16, 32, 64, 128])
+
+    def test_scaling_suite_stops_within_budget(self):
+        calls = []
+
+        def slow(arr):
+            calls.append(len(arr))
+            time.sleep(0.2)
+            return arr
+
+        start = time.perf_counter()
+        curves = scaling_suite({"slow": slow}, {"rev": lambda n, seed=None: list(range(n))},
+                               [64, 128], time_budget=0.1, min_time=0.0001)
+        elapsed = time.perf_counter() - start
+        # Первый же вызов сверх бюджета - последний: без повторов после калибровки
+        self.assertEqual(curves[0].stopped_at, 64)
+        self.assertEqual(calls, [64])
+        self.assertEqual(len(curves[0].results[-1].samples), 1)
+        self.assertLess(elapsed, 2 * 0.2)
+
+
+class TestInstrument(unittest.TestCase):
+    """Тестирование режима подсчета операций"""
+
+    def test_bubble_counts(self):
+        data = list(range(20, 0, -1))
+        result, ops = count_operations(bubble_sort, data)
+        self.assertEqual(result, sorted(data))
+        # Обратный порядок: n(n-1)/2 сравнений и по обмену (две записи) на каждое
+        self.assertEqual(ops.comparisons, 190)
+        self.assertEqual(ops.moves, 380)
+        self.assertGreaterEqual(ops.max_depth, 2)
+        self.assertGreater(ops.peak_memory, 0)
+
+    def test_key_calls_and_results(self):
+        data = [random.randint(-50, 50) for _ in range(100)]
+        for func in (quick_sort, heap_sort, merge_sort, bucket_sort):
+            result, ops = count_operations(func, data, key=abs, reverse=True)
+            self.assertEqual(result, sorted(data, key=abs, reverse=True))
+            self.assertEqual(ops.key_calls, len(data))
+            self.assertGreater(ops.comparisons, 0)
+        for func in (radix_sort, counting_sort):
+            result, ops = count_operations(func, data)
+            self.assertEqual(result, sorted(data))
+            # Не измерялись - не нули
+            self.assertIsNone(ops.comparisons)
+            self.assertIsNone(ops.moves)
+        result, _ = count_operations(select_kth, data, k=3)
+        self.assertEqual(result, sorted(data)[3])
+
+    def test_key_comparisons_not_doubled(self):
+        # Сравнение кортежей (ключ, индекс) не должно считать == отдельно
+        data = [random.random() for _ in range(300)]
+        for func in (heap_sort, merge_sort, bubble_sort, quick_sort):
+            plain = count_operations(func, data)[1].comparisons
+            keyed = count_operations(func, data, key=lambda x: x)[1].comparisons
+            if func is quick_sort:
+                # Сравнение кортежа с самим собой (опорный элемент) решается
+                # по идентичности, без сравнения ключей
+                self.assertLessEqual(keyed, plain)
+                self.assertGreater(keyed, 0.9 * plain)
+            else:
+                self.assertEqual(keyed, plain, func.__name__)
+
+    def test_bucket_moves(self):
+        data = [random.random() for _ in range(500)]
+        _, ops = count_operations(bucket_sort, data)
+        # Раскладка по корзинам, сортировка в корзинах и копирование обратно
+        self.assertGreater(ops.moves, 2 * len(data))
+
+    def test_disabled_by_default(self):
+        count_operations(quick_sort, [3, 1, 2])
+        self.assertIs(sorts._work_list, list)
+
+    def test_restores_profiler(self):
+        def outer_profiler(frame, event, arg):
+            pass
+
+        previous = sys.getprofile()
+        sys.setprofile(outer_profiler)
+        try:
+            count_operations(quick_sort, [3, 1, 2])
+            self.assertIs(sys.getprofile(), outer_profiler)
+        finally:
+            sys.setprofile(previous)
+
+    def test_benchmark_columns(self):
+        results = benchmark_sorts({"small": [3, 1, 2]}, {"Quick": quick_sort},
+                                  count_ops=True, repeat=2, min_time=0.0001)
+        self.assertGreater(results[0].ops.comparisons, 0)
+        self.assertIn("ops", results[0].as_dict())
+        plain = benchmark_sorts({"small": [3, 1, 2]}, {"Quick": quick_sort}, repeat=2, min_time=0.0001)
+        self.assertIsNone(plain[0].ops)
+
+
+    def test_trace_memory(self):
+        data = list(range(1000))
+        peak, blocks = trace_memory(merge_sort, data)
+        # Копия списка - не меньше 8 байт на элемент
+        self.assertGreaterEqual(peak, 8 * len(data))
+        self.assertGreater(blocks, 0)
+        inplace_peak, _ = trace_memory(heap_sort, data.copy(), inplace=True)
+        self.assertLess(inplace_peak, peak)
+
+    def test_benchmark_memory(self):
+        arrays = {"small": [random.randint(0, 100) for _ in range(500)]}
+        algos = {"Heap": heap_sort, "Parallel": parallel_sort}
+        copy_results = benchmark_memory(arrays, algos)
+        inplace_results = benchmark_memory(arrays, algos, inplace=True)
+        self.assertTrue(copy_results[0].ok)
+        self.assertGreater(copy_results[0].bytes_per_element, inplace_results[0].bytes_per_element)
+        self.assertTrue(inplace_results[0].inplace)
+        # Алгоритм без inplace дает ошибку только в режиме на месте
+        self.assertTrue(copy_results[1].ok)
+        self.assertFalse(inplace_results[1].ok)
+        self.assertIn("bytes_per_element", copy_results[0].as_dict())
+
+
+class TestIsolation(unittest.TestCase):
+    """Тестирование изолированного запуска бенчмарков"""
+
+    def test_timeout_and_errors(self):
+        cases = [BenchCase("bubble", "random", 100_000), BenchCase("quick", "random", 200),
+                 BenchCase("unknown", "random", 10)]
+        results = run_isolated(cases, timeout=2, memory_limit=1 << 30, repeat=2, min_time=0.0001)
+        self.assertIn("timeout", results[0].error)
+        self.assertTrue(results[1].ok)
+        self.assertEqual(results[1].n, 200)
+        self.assertIn("KeyError", results[2].error)
+
+    def test_parallel_jobs(self):
+        cases = [BenchCase(name, "random", 100, seed=1) for name in ("heap", "merge", "radix")]
+        results = run_isolated(cases, jobs=3, repeat=2, min_time=0.0001)
+        self.assertEqual([r.algorithm for r in results], ["heap", "merge", "radix"])
+        self.assertTrue(all(r.ok for r in results))
+        with self.assertRaises(ValueError):
+            run_isolated(cases, jobs=0)
+
+
+class TestResultsStore(unittest.TestCase):
+    """Тестирование хранилища результатов и поиска регрессий"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "results.jsonl")
+        fast = [1.0, 1.02, 0.98, 1.01, 0.99]
+        slow = [1.5, 1.52, 1.48, 1.51, 1.49]
+        save_results([BenchResult("random", "Quick", 100, fast, 1),
+                      BenchResult("random", "Heap", 100, fast, 1)], self.path, revision="aaa111")
+        save_results([BenchResult("random", "Quick", 100, slow, 1),
+                      BenchResult("random", "Heap", 100, fast, 1),
+                      BenchResult("random", "Broken", 100, error="boom")], self.path, revision="bbb222")
+
+    def test_save_and_load(self):
+        self.assertEqual(len(load_results(self.path)), 4)
+        records = load_results(self.path, revision="bbb")
+        self.assertEqual([r["algorithm"] for r in records], ["Quick", "Heap"])
+        self.assertEqual(records[0]["n"], 100)
+
+    def test_compare(self):
+        regressions, compared = compare(load_results(self.path, "aaa"), load_results(self.path, "bbb"))
+        self.assertEqual(compared, 2)
+        self.assertEqual([r["algorithm"] for r in regressions], ["Quick"])
+        self.assertAlmostEqual(regressions[0]["ratio"], 1.5)
+
+    def test_welch_t_test(self):
+        _, p = welch_t_test([1.0, 1.1, 0.9, 1.0], [2.0, 2.1, 1.9, 2.0])
+        self.assertLess(p, 0.01)
+        _, p = welch_t_test([2.0, 2.1, 1.9, 2.0], [1.0, 1.1, 0.9, 1.0])
+        self.assertGreater(p, 0.99)
+
+    def test_compare_command_exit_code(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(results_store_main(["compare", self.path, "--baseline", "aaa",
+                                                 "--current", "bbb"]), 1)
+            self.assertEqual(results_store_main(["compare", self.path, "--baseline", "aaa",
+                                                 "--current", "aaa"]), 0)
+            self.assertEqual(results_store_main(["compare", self.path, "--baseline", "aaa",
+                                                 "--current", "zzz"]), 2)
+
+
+class TestExternalSort(unittest.TestCase):
+    """Тестирование внешней сортировки файлов"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.input_path = os.path.join(self.tmp.name, "input")
+        self.output_path = os.path.join(self.tmp.name, "output")
+
+    def test_text_file(self):
+        values = [random.randint(-1000, 1000) for _ in range(500)]
+        with open(self.input_path, "w") as f:
+            f.write(" ".join(map(str, values[:250])) + "\n" + "\n".join(map(str, values[250:])))
+        # Маленький бюджет памяти дает много серий
+        for reverse in (False, True):
+            total = external_sort(self.input_path, self.output_path,
+                                  memory_limit=64 * 40, reverse=reverse)
+            self.assertEqual(total, len(values))
+            with open(self.output_path) as f:
+                result = [int(x) for x in f.read().split()]
+            self.assertEqual(result, sorted(values, reverse=reverse))
+
+    def test_binary_file(self):
+        values = [random.uniform(-1, 1) for _ in range(300)]
+        with open(self.input_path, "wb") as f:
+            array('d', values).tofile(f)
+        external_sort(self.input_path, self.output_path, binary=True,
+                      typecode='d', memory_limit=64 * 50)
+        result = array('d')
+        with open(self.output_path, "rb") as f:
+            result.frombytes(f.read())
+        self.assertEqual(result.tolist(), sorted(values))
+
+    def test_multi_pass_merge(self):
+        values = [random.randint(-10 ** 6, 10 ** 6) for _ in range(1000)]
+        with open(self.input_path, "wb") as f:
+            array('q', values).tofile(f)
+        # 32 * 10 байт - серии по 10 элементов: 100 серий при fan-in 3 -
+        # несколько промежуточных проходов
+        for reverse in (False, True):
+            external_sort(self.input_path, self.output_path, binary=True,
+                          memory_limit=32 * 10, reverse=reverse, max_fan_in=3)
+            result = array('q')
+            with open(self.output_path, "rb") as f:
+                result.frombytes(f.read())
+            self.assertEqual(result.tolist(), sorted(values, reverse=reverse))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            external_sort(self.input_path, self.output_path, typecode='s')
+        with self.assertRaises(ValueError):
+            external_sort(self.input_path, self.output_path, max_fan_in=1)
+        with self.assertRaises(ValueError):
+            external_sort(self.input_path, self.output_path, memory_limit=0)
+
+
+
+class TestStreaming(unittest.TestCase):
+    """Тестирование потокового чтения чисел в компактные буферы"""
+
+    def test_read_text(self):
+        # Маленький блок проверяет перенос числа через границу блоков
+        values = read_text(io.BytesIO(b"10 -2\n 333\t4 5"), block_bytes=3)
+        self.assertEqual(values, array('q', [10, -2, 333, 4, 5]))
+        values = read_text(io.BytesIO(b"1 2 3.5 4"), block_bytes=4)
+        self.assertEqual(values, array('d', [1.0, 2.0, 3.5, 4.0]))
+        with self.assertRaises(ValueError):
+            read_text(io.BytesIO(b"1 2.5"), typecode='q')
+
+    def test_binary_and_mmap(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.bin")
+            values = array('q', [random.randint(-10 ** 12, 10 ** 12) for _ in range(1000)])
+            with open(path, "wb") as f:
+                values.tofile(f)
+            with open(path, "rb") as f:
+                self.assertEqual(read_binary(f), values)
+            with map_binary(path) as view:
+                self.assertEqual(view.tolist(), values.tolist())
+            with open(path, "ab") as f:
+                f.write(b"\x00")
+            with self.assertRaises(ValueError):
+                with map_binary(path):
+                    pass
+
+    def test_write_text(self):
+        out = io.BytesIO()
+        write_text(out, array('q', [3, 1, 2]), block_items=2)
+        self.assertEqual(out.getvalue(), b"3\n1\n2\n")
+
+
+class TestBackends(unittest.TestCase):
+    """Тестирование выбора бэкенда и совпадения результатов бэкендов"""
+
+    def test_selection(self):
+        self.assertIn("python", backends.available_backends())
+        previous = backends.get_backend()
+        with backends.use_backend("python"):
+            self.assertEqual(backends.get_backend(), "python")
+        self.assertEqual(backends.get_backend(), previous)
+        with self.assertRaises(ValueError):
+            backends.set_backend("fortran")
+
+    @unittest.skipUnless(backends.np is not None, "NumPy is not installed")
+    def test_numpy_matches_python(self):
+        def run(backend, func):
+            with backends.use_backend(backend):
+                random.seed(5)
+                return func(), random.random()
+
+        for name, gen in GENERATORS.items():
+            def generate():
+                return gen(5000, seed=11)
+
+            self.assertEqual(run("python", generate), run("numpy", generate), name)
+
+        def duplicates():
+            return many_duplicates(3000, k_unique=2000)
+
+        self.assertEqual(run("python", duplicates), run("numpy", duplicates))
+        data = [random.randint(-10 ** 12, 10 ** 12) for _ in range(3000)]
+        floats = array('d', (random.uniform(-1, 1) for _ in range(3000)))
+        # Целые от 2**63 не помещаются в int64: точность не должна теряться во float64
+        huge = [2 ** 63 + i * 10 ** 7 for i in range(1500)] + list(range(1500))
+        huge_signed = huge + [-1]
+        for func in (lambda: radix_sort(data, reverse=True), lambda: counting_sort(data),
+                     lambda: radix_sort(floats), lambda: counting_sort(bytearray(x % 256 for x in data[:2000])),
+                     lambda: radix_sort(huge), lambda: counting_sort(huge, reverse=True),
+                     lambda: radix_sort(huge_signed), lambda: counting_sort(huge_signed)):
+            self.assertEqual(run("python", func), run("numpy", func))
+        with backends.use_backend("numpy"):
+            self.assertEqual(counting_sort(huge)[-1], 2 ** 63 + 1499 * 10 ** 7)
+
+    @unittest.skipUnless(backends.np is not None, "NumPy is not installed")
+    def test_to_ndarray_dtype_by_range(self):
+        np = backends.np
+        self.assertEqual(backends._to_ndarray([-(2 ** 63), 2 ** 63 - 1]).dtype, np.int64)
+        self.assertEqual(backends._to_ndarray([0, 2 ** 64 - 1]).dtype, np.uint64)
+        self.assertEqual(backends._to_ndarray([1.5, 2 ** 63]).dtype, np.float64)
+        # Без проверки диапазона NumPy < 2 заворачивал бы -1 в uint64
+        self.assertIsNone(backends._to_ndarray([-1, 2 ** 63]))
+        self.assertIsNone(backends._to_ndarray([0, 2 ** 64]))
+        self.assertIsNone(backends._to_ndarray([0.5, 2 ** 1024]))
+
+    def test_benchmark_backends(self):
+        arrays = {"small": [3, 1, 2]}
+        results = benchmark_backends(arrays, {"Radix": radix_sort}, repeat=2, min_time=0.0001)
+        self.assertEqual(len(results), len(backends.available_backends()))
+        self.assertEqual(results[0].algorithm, f"Radix [{backends.available_backends()[0]}]")
+        results = benchmark_generators({"random": GENERATORS["random"]}, 100, names=["python"],
+                                       repeat=2, min_time=0.0001)
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[0].algorithm, "python")
+
+    def test_benchmark_math(self):
+        results = benchmark_math({"factorial": factorial, "fast": factorial_fast}, [10, 100],
+                                 repeat=2, min_time=0.0001)
+        self.assertEqual([(r.algorithm, r.n) for r in results],
+                         [("factorial", 10), ("fast", 10), ("factorial", 100), ("fast", 100)])
+        self.assertTrue(all(r.ok for r in results))
+        results = benchmark_math({"bad": factorial}, [-1], repeat=1)
+        self.assertIn("ValueError", results[0].error)
+
+
+class TestCLI(unittest.TestCase):
+    """Тестирование неинтерактивной командной строки"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def run_cli(self, argv, stdin=b""):
+        # Двоичные буферы за текстовыми потоками, как у настоящих stdin/stdout
+        out = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        err = io.StringIO()
+        real_stdin = cli.sys.stdin
+        if isinstance(stdin, str):
+            stdin = stdin.encode()
+        cli.sys.stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(stdin)))
+        try:
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                code = cli.main(argv)
+        finally:
+            cli.sys.stdin = real_stdin
+        out.flush()
+        return code, out.buffer.getvalue(), err.getvalue()
+
+    def test_sort(self):
+        code, out, _ = self.run_cli(["sort", "-a", "quick", "-r", "-f", "json"], "3 1 2")
+        self.assertEqual((code, json.loads(out)), (0, [3, 2, 1]))
+        code, out, _ = self.run_cli(["sort", "-f", "csv"], "[2.5, 1, -3]")
+        self.assertEqual(out.split(), [b"value", b"-3.0", b"1.0", b"2.5"])
+        code, out, _ = self.run_cli(["sort", "-a", "radix", "--binary"],
+                                    array('q', [5, -1, 3]).tobytes())
+        self.assertEqual(array('q', out).tolist(), [-1, 3, 5])
+        code, _, err = self.run_cli(["sort"], "1 x")
+        self.assertEqual(code, 1)
+        self.assertIn("Ошибка", err)
+
+    def test_gen_and_external_sort(self):
+        data_path = os.path.join(self.tmp.name, "data.txt")
+        out_path = os.path.join(self.tmp.name, "sorted.txt")
+        self.assertEqual(self.run_cli(["gen", "random", "200", "--seed", "3", "-o", data_path])[0], 0)
+        code, _, _ = self.run_cli(["sort", data_path, "--external", "-o", out_path])
+        self.assertEqual(code, 0)
+        with open(data_path) as f:
+            values = [int(x) for x in f.read().split()]
+        with open(out_path) as f:
+            self.assertEqual([int(x) for x in f.read().split()], sorted(values))
+
+    def test_math(self):
+        code, out, _ = self.run_cli(["math", "fibo", "10", "-f", "json"])
+        self.assertEqual(json.loads(out)["result"], 55)
+        self.assertEqual(self.run_cli(["math", "factorial", "-1"])[0], 1)
+
+    def test_math_long_result(self):
+        # Больше 4300 цифр - предела int -> str по умолчанию в Python 3.11+
+        code, out, _ = self.run_cli(["math", "fibo_fast", "30000"])
+        self.assertEqual(code, 0)
+        digits = out.strip()
+        self.assertGreater(len(digits), 4300)
+        self.assertEqual(digits[-9:], b"%09d" % (fibo_mod(30000, 10 ** 9)))
+        code, out, _ = self.run_cli(["math", "factorial_fast", "2000", "-f", "json"])
+        self.assertEqual(code, 0)
+        self.assertGreater(len(out), 4300)
+        self.assertTrue(out.rstrip().endswith(b"0" * 400 + b"}"))
+
+    def test_bench(self):
+        save_path = os.path.join(self.tmp.name, "results.jsonl")
+        code, out, _ = self.run_cli(["bench", "-a", "quick", "heap", "-g", "random", "reverse_sorted",
+                                     "-n", "50", "--repeat", "2", "--count-ops", "-f", "csv",
+                                     "--save", save_path])
+        self.assertEqual(code, 0)
+        rows = out.decode().strip().splitlines()
+        self.assertEqual(len(rows), 5)
+        self.assertIn("comparisons", rows[0])
+        self.assertEqual(len(load_results(save_path)), 4)
+
+    def test_main_dispatch(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            with self.assertRaises(SystemExit) as ctx:
+                main_module.main(["math", "factorial", "5"])
+        self.assertEqual(ctx.exception.code, 0)
+        self.assertEqual(out.getvalue().strip(), "120")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file